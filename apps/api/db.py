@@ -46,7 +46,15 @@ class Base(DeclarativeBase):
 
 DATABASE_URL = _make_async_url(os.getenv("DATABASE_URL"))
 
-engine = create_async_engine(DATABASE_URL, future=True, echo=False)
+engine = create_async_engine(
+    DATABASE_URL,
+    future=True,
+    echo=False,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_POOL_OVERFLOW", "40")),
+    pool_recycle=1800,
+    pool_pre_ping=True,
+)
 AsyncSessionFactory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
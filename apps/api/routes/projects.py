@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from fastapi.responses import FileResponse, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,7 +23,9 @@ from apps.api.schemas.experiments import (
 from apps.api.schemas.projects import (
     ProjectCreate,
     ProjectJobCancel,
+    ProjectJobCounts,
     ProjectJobCreated,
+    ProjectJobPage,
     ProjectJobStatus,
     ProjectJobSummary,
     ProjectOut,
@@ -135,6 +137,26 @@ async def create_project_steadydancer_job(
     return ProjectJobCreated(project_id=project_id, job_id=job.id, task_id=job.task_id)
 
 
+@router.get(
+    "/{project_id}/steadydancer/jobs/counts",
+    response_model=ProjectJobCounts,
+)
+async def count_project_jobs(
+    project_id: UUID,
+    session: AsyncSession = Depends(get_session),
+) -> ProjectJobCounts:
+    """
+    Count SteadyDancer jobs under a project by status.
+
+    Registered before /jobs/{job_id} so "counts" is not parsed as a job id.
+    """
+    by_status = await job_service.count_project_jobs_by_status(
+        session=session,
+        project_id=project_id,
+    )
+    return ProjectJobCounts(total=sum(by_status.values()), by_status=by_status)
+
+
 @router.get(
     "/{project_id}/steadydancer/jobs/{job_id}",
     response_model=ProjectJobStatus,
@@ -279,17 +301,32 @@ async def download_project_steadydancer_job_video(
     )
 @router.get(
     "/{project_id}/steadydancer/jobs",
-    response_model=list[ProjectJobSummary],
+    response_model=ProjectJobPage,
 )
 async def list_project_jobs(
     project_id: UUID,
+    limit: int = Query(50, ge=1, le=200),
+    before_id: UUID | None = None,
     session: AsyncSession = Depends(get_session),
-) -> list[ProjectJobSummary]:
+) -> ProjectJobPage:
     """
-    List all SteadyDancer jobs under a project.
+    List SteadyDancer jobs under a project, newest first, one page at a time.
     """
-    jobs = await job_service.list_project_jobs(session=session, project_id=project_id)
-    return [ProjectJobSummary.model_validate(j) for j in jobs]
+    # Fetch one extra row to know whether another page exists.
+    items = [
+        ProjectJobSummary.model_validate(j)
+        async for j in job_service.list_project_jobs(
+            session=session,
+            project_id=project_id,
+            limit=limit + 1,
+            before_id=before_id,
+        )
+    ]
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = items[-1].id
+    return ProjectJobPage(items=items, next_cursor=next_cursor)
 
 
 @router.post(
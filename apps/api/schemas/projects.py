@@ -55,3 +55,19 @@ class ProjectJobSummary(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ProjectJobPage(BaseModel):
+    items: list[ProjectJobSummary]
+    next_cursor: UUID | None = Field(
+        None,
+        description="Pass as `before_id` to fetch the next page; null on the last page.",
+    )
+
+
+class ProjectJobCounts(BaseModel):
+    total: int
+    by_status: dict[str, int] = Field(
+        default_factory=dict,
+        description="Number of jobs per stored status (statuses with no jobs are omitted).",
+    )
@@ -4,6 +4,11 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from libs.py_core.steadydancer_prompts import PROMPT_TEMPLATES
+
+
+_PROMPT_KEY_PATTERN = "^(" + "|".join(f"{lang}/{style}" for lang, style in PROMPT_TEMPLATES) + ")$"
+
 
 class SteadyDancerJobCreate(BaseModel):
     input_dir: str = Field(
@@ -17,6 +22,14 @@ class SteadyDancerJobCreate(BaseModel):
         None,
         description="Optional prompt override; falls back to prompt.txt if omitted.",
     )
+    prompt_key: str | None = Field(
+        None,
+        pattern=_PROMPT_KEY_PATTERN,
+        description=(
+            "Optional built-in prompt template as 'lang/style', e.g. 'en/realistic'. "
+            "Ignored when prompt_override is set."
+        ),
+    )
     size: str = Field(
         "1024*576",
         description="Output resolution, e.g. 1024*576. Must be supported by upstream.",
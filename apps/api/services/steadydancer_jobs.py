@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import shutil
 import json
+import stat
 from pathlib import Path
-from typing import Any, Tuple
+from typing import Any, AsyncIterator, Tuple
 from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from celery import states
+from sqlalchemy import func, lambda_stmt, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.api.db import Experiment, Job, Project, utcnow
@@ -15,12 +19,18 @@ from libs.py_core.celery_client import celery_client
 from libs.py_core.projects import (
     ensure_job_dirs,
     from_data_relative,
+    get_job_root,
     resolve_repo_relative,
     to_data_relative,
 )
 from libs.py_core.s3_storage import is_s3_enabled, upload_file_to_s3
 
 
+# Prebuilt signature for the I2V task; apply_async() merges per-call args
+# without mutating it, so the task-name resolution is cached across calls.
+_I2V_SIG = celery_client.signature("steadydancer.generate.i2v")
+
+
 class ProjectNotFoundError(Exception):
     """
     Raised when a project cannot be found for a given ID.
@@ -55,6 +65,8 @@ def build_task_payload(payload: SteadyDancerJobCreate, input_dir: Path) -> dict[
         "cuda_visible_devices": payload.cuda_visible_devices,
     }
     # Optional advanced parameters are only included when explicitly set.
+    if payload.prompt_key is not None:
+        data["prompt_key"] = payload.prompt_key
     if payload.sample_steps is not None:
         data["sample_steps"] = payload.sample_steps
     if payload.sample_shift is not None:
@@ -70,23 +82,25 @@ def enqueue_steadydancer_task(task_payload: dict[str, Any]) -> str:
     """
     Enqueue a SteadyDancer Celery task and return its task_id.
     """
-    task = celery_client.send_task("steadydancer.generate.i2v", args=[task_payload])
-    return task.id
+    return _I2V_SIG.apply_async(args=(task_payload,)).id
 
 
 def query_celery_task(task_id: str) -> Tuple[str, dict[str, Any] | None, Exception | None]:
     """
     Query Celery for a given task_id and return (state, result, error).
+
+    Reads the task meta straight from the result backend in a single
+    round-trip instead of going through an AsyncResult instance.
     """
-    async_result = celery_client.AsyncResult(task_id)
-    state = async_result.state
+    meta = celery_client.backend.get_task_meta(task_id)
+    state = meta["status"]
 
-    if async_result.failed():
-        return state, None, async_result.info  # type: ignore[return-value]
+    if state == states.FAILURE:
+        return state, None, meta.get("result")
 
     result: dict[str, Any] | None
-    if async_result.successful():
-        data = async_result.result
+    if state == states.SUCCESS:
+        data = meta.get("result")
         if isinstance(data, dict):
             result = data
         else:
@@ -116,23 +130,30 @@ async def create_project_steadydancer_job(
     if project is None:
         raise ProjectNotFoundError(f"Project not found: {project_id}")
 
-    job_id = uuid4()
-    job_paths = ensure_job_dirs(project_id=project_id, job_id=job_id)
-
     # If an experiment is provided and has a canonical input_dir, prefer it.
+    # Both helpers already return absolute paths, so a single stat is enough
+    # to validate the source before any job directories are created.
     if experiment is not None and experiment.input_dir:
         source_input_dir = from_data_relative(experiment.input_dir)
     else:
         source_input_dir = resolve_repo_relative(payload.input_dir)
 
-    if not source_input_dir.is_dir():
+    src_str = os.fspath(source_input_dir)
+    try:
+        src_is_dir = stat.S_ISDIR(os.stat(src_str).st_mode)
+    except OSError:
+        src_is_dir = False
+    if not src_is_dir:
         raise InputDirNotFoundError(
-            f"input_dir not found or not a directory: {source_input_dir}"
+            f"input_dir not found or not a directory: {src_str}"
         )
 
+    job_id = uuid4()
+    job_paths = ensure_job_dirs(project_id=project_id, job_id=job_id)
+
     try:
         shutil.copytree(
-            source_input_dir,
+            src_str,
             job_paths.input_dir,
             dirs_exist_ok=True,
         )
@@ -177,12 +198,19 @@ async def create_project_steadydancer_job(
     return job
 
 
+def _job_output_prefix(job: Job) -> str:
+    """
+    Return the absolute output directory of a job as a string prefix.
+    """
+    return os.path.join(get_job_root(job.project_id, job.id), "output") + os.sep
+
+
 async def refresh_project_job_status(
     session: AsyncSession,
     job: Job,
 ) -> Tuple[str, dict[str, Any] | None, str | None]:
     """
-    Refresh a project's job status from Celery and persist the changes.
+    Refresh a project's job status from Celery and persist any changes.
 
     Returns (state, result, error_message).
     """
@@ -195,7 +223,8 @@ async def refresh_project_job_status(
         job.error_message = error_msg
         if job.finished_at is None:
             job.finished_at = utcnow()
-        await session.commit()
+        if session.is_modified(job):
+            await session.commit()
         return state, None, error_msg
 
     if result is not None:
@@ -215,9 +244,14 @@ async def refresh_project_job_status(
                     result["video_path"] = stored
                 else:
                     result["video_path"] = str(from_data_relative(stored))
+            elif not is_s3_enabled() and str(video_path_value).startswith(
+                _job_output_prefix(job)
+            ):
+                # Worker already wrote into this job's output dir and there is
+                # nothing to upload: record it without resolving / stat-ing.
+                job.result_video_path = to_data_relative(video_path_value)
+                result["video_path"] = str(video_path_value)
             else:
-                from pathlib import Path
-
                 src = Path(str(video_path_value)).expanduser().resolve()
                 if src.is_file():
                     # When S3 is configured, prefer uploading the result video
@@ -225,7 +259,9 @@ async def refresh_project_job_status(
                     if is_s3_enabled():
                         try:
                             key = f"projects/{job.project_id}/jobs/{job.id}/output/{src.name}"
-                            s3_url = upload_file_to_s3(src, key)
+                            # The upload can take seconds for large videos; keep
+                            # it off the event loop.
+                            s3_url = await asyncio.to_thread(upload_file_to_s3, src, key)
                             job.result_video_path = s3_url
                             result["video_path"] = s3_url
                         except Exception:
@@ -256,7 +292,10 @@ async def refresh_project_job_status(
         else:
             job.status = state
 
-    await session.commit()
+    # Polls of unchanged jobs (e.g. still PENDING) don't need a round-trip.
+    # No rollback either: it would expire `job` for the caller.
+    if session.is_modified(job):
+        await session.commit()
 
     return state, result, None
 
@@ -264,16 +303,48 @@ async def refresh_project_job_status(
 async def list_project_jobs(
     session: AsyncSession,
     project_id: UUID,
-) -> list[Job]:
+    limit: int = 50,
+    before_id: UUID | None = None,
+) -> AsyncIterator[Job]:
     """
-    List all jobs under a project ordered by creation time (newest first).
+    Stream one page of jobs under a project ordered by creation time (newest first).
+
+    Pagination is keyset-based: when `before_id` is given, only jobs created
+    strictly before that job (ties broken by id) are returned. Rows are
+    fetched through a server-side cursor instead of being buffered up front.
     """
-    result = await session.execute(
-        select(Job)
+    stmt = lambda_stmt(lambda: select(Job).where(Job.project_id == project_id))
+    if before_id is not None:
+        stmt += lambda s: s.where(
+            tuple_(Job.created_at, Job.id)
+            < tuple_(
+                select(Job.created_at).where(Job.id == before_id).scalar_subquery(),
+                before_id,
+            )
+        )
+    stmt += lambda s: s.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit)
+
+    result = await session.stream_scalars(stmt)
+    async for job in result:
+        yield job
+
+
+async def count_project_jobs_by_status(
+    session: AsyncSession,
+    project_id: UUID,
+) -> dict[str, int]:
+    """
+    Count all jobs under a project, grouped by stored status.
+
+    Lets summaries (e.g. the dashboard) avoid paging through every job.
+    """
+    stmt = lambda_stmt(
+        lambda: select(Job.status, func.count())
         .where(Job.project_id == project_id)
-        .order_by(Job.created_at.desc())
+        .group_by(Job.status)
     )
-    return list(result.scalars().all())
+    result = await session.execute(stmt)
+    return {status: count for status, count in result.all()}
 
 
 async def list_experiment_jobs(
@@ -284,14 +355,15 @@ async def list_experiment_jobs(
     """
     List all jobs under a specific experiment.
     """
-    result = await session.execute(
-        select(Job)
+    stmt = lambda_stmt(
+        lambda: select(Job)
         .where(
             Job.project_id == project_id,
             Job.experiment_id == experiment_id,
         )
         .order_by(Job.created_at.desc())
     )
+    result = await session.execute(stmt)
     return list(result.scalars().all())
 
 
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import os
+from pathlib import Path
 
 from fastapi import Depends, FastAPI
 from fastapi.testclient import TestClient
 
 from apps.api.main import API_KEY_ENV_NAME, API_KEY_HEADER_NAME, require_api_key
-from libs.py_core.projects import get_repo_root, resolve_repo_relative
+from libs.py_core.config import get_models_dir
+from libs.py_core.projects import (
+    from_data_relative,
+    get_data_root,
+    get_repo_root,
+    resolve_repo_relative,
+    to_data_relative,
+)
 
 
 def _create_test_app() -> FastAPI:
@@ -89,3 +97,49 @@ def test_resolve_repo_relative_relative_path() -> None:
     # And it should end with the relative suffix (path-separator aware).
     assert str(resolved).endswith(os.path.join("some", "subdir", "file.txt"))
 
+
+def test_default_roots_are_inside_the_repo(monkeypatch) -> None:
+    """
+    Without env overrides, models/ and data/ default to <repo_root>/models and
+    <repo_root>/data.
+    """
+    # apps/api/tests/<this file> -> tests -> api -> apps -> repo_root
+    repo_root = Path(__file__).resolve().parents[3]
+    assert get_repo_root() == repo_root
+
+    monkeypatch.delenv("MODELS_DIR", raising=False)
+    monkeypatch.delenv("STEADYDANCER_DATA_DIR", raising=False)
+    monkeypatch.delenv("DATA_DIR", raising=False)
+    get_models_dir.cache_clear()
+    get_data_root.cache_clear()
+    try:
+        assert get_models_dir() == repo_root / "models"
+        assert get_data_root() == repo_root / "data"
+    finally:
+        get_models_dir.cache_clear()
+        get_data_root.cache_clear()
+
+
+def test_data_relative_helpers_are_memoized(monkeypatch, tmp_path) -> None:
+    """
+    Cached to/from_data_relative results match the uncached implementations.
+    """
+    monkeypatch.setenv("STEADYDANCER_DATA_DIR", str(tmp_path))
+    get_data_root.cache_clear()
+    to_data_relative.cache_clear()
+    from_data_relative.cache_clear()
+
+    job_input = tmp_path / "projects" / "p1" / "jobs" / "j1" / "input"
+    rel = to_data_relative(job_input)
+    assert rel == "projects/p1/jobs/j1/input"
+    assert to_data_relative(job_input) == to_data_relative.__wrapped__(job_input)
+    assert to_data_relative.cache_info().hits == 1
+
+    resolved = from_data_relative(rel)
+    assert resolved == from_data_relative.__wrapped__(rel)
+    assert from_data_relative(rel) == job_input.resolve()
+    assert from_data_relative.cache_info().hits == 1
+
+    get_data_root.cache_clear()
+    to_data_relative.cache_clear()
+    from_data_relative.cache_clear()
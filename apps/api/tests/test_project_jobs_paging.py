@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from apps.api.db import Base, Job, Project, get_session
+from apps.api.routes import projects as project_routes
+from apps.api.services import steadydancer_jobs as job_service
+
+
+PROJECT_ID = uuid4()
+
+# Newest first, as the service orders them.
+JOBS = [
+    SimpleNamespace(
+        id=uuid4(),
+        project_id=PROJECT_ID,
+        experiment_id=None,
+        task_id=f"task-{i}",
+        job_type="steadydancer",
+        status="SUCCESS",
+        result_video_path=None,
+    )
+    for i in range(5)
+]
+
+
+def _create_test_app(monkeypatch, calls: list[dict]) -> FastAPI:
+    """
+    Mount the projects router over an in-memory job list (no database).
+    """
+
+    async def fake_list_project_jobs(session, project_id, limit=50, before_id=None):
+        calls.append({"limit": limit, "before_id": before_id})
+        start = 0
+        if before_id is not None:
+            start = next(i for i, job in enumerate(JOBS) if job.id == before_id) + 1
+        for job in JOBS[start : start + limit]:
+            yield job
+
+    async def fake_session():
+        yield None
+
+    monkeypatch.setattr(
+        project_routes.job_service, "list_project_jobs", fake_list_project_jobs
+    )
+    app = FastAPI()
+    app.include_router(project_routes.router)
+    app.dependency_overrides[get_session] = fake_session
+    return app
+
+
+def test_list_project_jobs_pages_with_cursor(monkeypatch) -> None:
+    """
+    Pages are cut at `limit`, chained through next_cursor/before_id, and the
+    last page has no cursor.
+    """
+    calls: list[dict] = []
+    client = TestClient(_create_test_app(monkeypatch, calls))
+    url = f"/projects/{PROJECT_ID}/steadydancer/jobs"
+
+    # The route asks the service for limit + 1 rows to detect another page.
+    first = client.get(url, params={"limit": 2}).json()
+    assert calls[-1] == {"limit": 3, "before_id": None}
+    assert [item["task_id"] for item in first["items"]] == ["task-0", "task-1"]
+    assert first["next_cursor"] == str(JOBS[1].id)
+
+    second = client.get(url, params={"limit": 2, "before_id": first["next_cursor"]}).json()
+    assert calls[-1] == {"limit": 3, "before_id": JOBS[1].id}
+    assert isinstance(calls[-1]["before_id"], UUID)
+    assert [item["task_id"] for item in second["items"]] == ["task-2", "task-3"]
+    assert second["next_cursor"] == str(JOBS[3].id)
+
+    # Exactly `limit` rows left: still the last page.
+    last = client.get(url, params={"limit": 1, "before_id": str(JOBS[3].id)}).json()
+    assert [item["task_id"] for item in last["items"]] == ["task-4"]
+    assert last["next_cursor"] is None
+
+
+def test_list_project_jobs_single_page(monkeypatch) -> None:
+    """
+    The default limit returns everything at once with a null cursor.
+    """
+    calls: list[dict] = []
+    client = TestClient(_create_test_app(monkeypatch, calls))
+
+    page = client.get(f"/projects/{PROJECT_ID}/steadydancer/jobs").json()
+    assert calls[-1] == {"limit": 51, "before_id": None}
+    assert len(page["items"]) == len(JOBS)
+    assert page["next_cursor"] is None
+
+
+def test_list_project_jobs_keyset_breaks_created_at_ties_on_id(tmp_path) -> None:
+    """
+    Run the real keyset query: jobs sharing created_at are ordered by id and
+    a cursor on one of them resumes with the next id, skipping nothing.
+    """
+    pytest.importorskip("aiosqlite")
+    asyncio.run(_check_keyset_pages(tmp_path / "jobs.db"))
+
+
+# Postgres-only column types, mapped to SQLite equivalents for the test DB
+# (a column declared "UUID" would get numeric affinity in SQLite).
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_for_sqlite(type_, compiler, **kw) -> str:
+    return "JSON"
+
+
+@compiles(PG_UUID, "sqlite")
+def _compile_uuid_for_sqlite(type_, compiler, **kw) -> str:
+    return "CHAR(32)"
+
+
+async def _check_keyset_pages(db_path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    t0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    project, other = Project(name="paging"), Project(name="other")
+
+    def job(project: Project, n: int, seconds: int) -> Job:
+        return Job(
+            id=UUID(int=n),
+            project=project,
+            task_id=f"task-{project.name}-{n}",
+            job_type="steadydancer",
+            status="SUCCESS",
+            input_dir="input",
+            params={},
+            created_at=t0 + timedelta(seconds=seconds),
+        )
+
+    # Expected order: 5 (t+2), then the t+1 tie as 4, 3, 2, then 1 (t+0).
+    jobs = [job(project, 1, 0), job(project, 2, 1), job(project, 3, 1), job(project, 4, 1)]
+    jobs += [job(project, 5, 2), job(other, 6, 1)]
+
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            session.add_all(jobs)
+            await session.commit()
+
+            async def page(limit: int, before_id: UUID | None = None) -> list[int]:
+                return [
+                    j.id.int
+                    async for j in job_service.list_project_jobs(
+                        session=session,
+                        project_id=project.id,
+                        limit=limit,
+                        before_id=before_id,
+                    )
+                ]
+
+            assert await page(10) == [5, 4, 3, 2, 1]
+            assert await page(2) == [5, 4]
+            # Cursor inside the tie: same created_at, smaller ids only.
+            assert await page(2, before_id=UUID(int=4)) == [3, 2]
+            assert await page(2, before_id=UUID(int=2)) == [1]
+            assert await page(2, before_id=UUID(int=1)) == []
+    finally:
+        await engine.dispose()
@@ -13,6 +13,8 @@ import type {
     JobCreated,
     JobStatus,
     JobSummary,
+    JobPage,
+    JobCounts,
     HealthStatus,
     ApiError,
 } from "./types";
@@ -168,9 +170,22 @@ class ApiClient {
     }
 
     // Jobs
-    async listProjectJobs(projectId: string): Promise<JobSummary[]> {
-        return this.request<JobSummary[]>(
-            `/projects/${projectId}/steadydancer/jobs`
+    async listProjectJobs(
+        projectId: string,
+        params: { limit?: number; beforeId?: string } = {}
+    ): Promise<JobPage> {
+        const query = new URLSearchParams();
+        if (params.limit !== undefined) query.set("limit", String(params.limit));
+        if (params.beforeId) query.set("before_id", params.beforeId);
+        const qs = query.toString();
+        return this.request<JobPage>(
+            `/projects/${projectId}/steadydancer/jobs${qs ? `?${qs}` : ""}`
+        );
+    }
+
+    async countProjectJobs(projectId: string): Promise<JobCounts> {
+        return this.request<JobCounts>(
+            `/projects/${projectId}/steadydancer/jobs/counts`
         );
     }
 
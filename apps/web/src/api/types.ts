@@ -41,6 +41,7 @@ export interface MotionAssetCreate {
 
 export interface ExperimentConfig {
     prompt_override?: string | null;
+    prompt_key?: string | null;
     size?: string;
     frame_num?: number;
     sample_guide_scale?: number;
@@ -129,6 +130,16 @@ export interface JobSummary {
     result_video_path: string | null;
 }
 
+export interface JobPage {
+    items: JobSummary[];
+    next_cursor: string | null;
+}
+
+export interface JobCounts {
+    total: number;
+    by_status: Record<string, number>;
+}
+
 export interface JobResult {
     success: boolean;
     video_path: string | null;
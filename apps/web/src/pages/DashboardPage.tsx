@@ -19,22 +19,27 @@ export function DashboardPage() {
                 const projectList = await api.listProjects();
                 setProjects(projectList.slice(0, 5)); // Show recent 5
 
-                // Fetch jobs from all projects
+                // Recent jobs only need the first few of each project
                 const allJobs: JobSummary[] = [];
                 for (const project of projectList.slice(0, 3)) {
-                    const jobs = await api.listProjectJobs(project.id);
-                    allJobs.push(...jobs);
+                    const page = await api.listProjectJobs(project.id, { limit: 5 });
+                    allJobs.push(...page.items);
                 }
 
                 // Sort by id (newest first) and take recent 5
                 const sorted = allJobs.slice(0, 5);
                 setRecentJobs(sorted);
 
-                // Calculate stats
-                const running = allJobs.filter(
-                    (j) => j.status === "PENDING" || j.status === "STARTED"
-                ).length;
-                const completed = allJobs.filter((j) => j.status === "SUCCESS").length;
+                // Stats come from per-project counts, not from the job pages
+                const counts = await Promise.all(
+                    projectList.map((project) => api.countProjectJobs(project.id))
+                );
+                let running = 0;
+                let completed = 0;
+                for (const { by_status } of counts) {
+                    running += (by_status.PENDING ?? 0) + (by_status.STARTED ?? 0);
+                    completed += by_status.SUCCESS ?? 0;
+                }
 
                 setStats({
                     totalProjects: projectList.length,
@@ -1,8 +1,9 @@
-import { useEffect, useState, useCallback } from "react";
+import { useEffect, useState, useCallback, useRef } from "react";
 import { useParams } from "react-router-dom";
 import {
     api,
     type JobSummary,
+    type JobPage,
     type JobStatus,
     type Experiment,
     type SteadyDancerJobCreate,
@@ -22,6 +23,12 @@ export function JobsTab() {
     const { projectId } = useParams<{ projectId: string }>();
     const [jobs, setJobs] = useState<JobSummary[]>([]);
     const [loading, setLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    // Number of pages shown; each poll re-fetches all of them.
+    const pagesRef = useRef(1);
+    // Project the list belongs to, so responses for a previous one are dropped.
+    const projectRef = useRef(projectId);
     const [showCreateModal, setShowCreateModal] = useState(false);
     const [selectedJob, setSelectedJob] = useState<JobSummary | null>(null);
     const [jobDetail, setJobDetail] = useState<JobStatus | null>(null);
@@ -29,21 +36,49 @@ export function JobsTab() {
     const fetchJobs = useCallback(async () => {
         if (!projectId) return;
         try {
-            const data = await api.listProjectJobs(projectId);
-            setJobs(data);
+            // Replace the whole loaded range so older rows get status updates
+            // and deleted jobs disappear.
+            const items: JobSummary[] = [];
+            let cursor: string | null = null;
+            for (let i = 0; i < pagesRef.current; i++) {
+                const page: JobPage = await api.listProjectJobs(
+                    projectId,
+                    cursor ? { beforeId: cursor } : {}
+                );
+                items.push(...page.items);
+                cursor = page.next_cursor;
+                if (!cursor) break;
+            }
+            if (projectRef.current !== projectId) return;
+            setJobs(items);
+            setNextCursor(cursor);
         } catch (err) {
             console.error("Failed to fetch jobs:", err);
         } finally {
-            setLoading(false);
+            if (projectRef.current === projectId) setLoading(false);
         }
     }, [projectId]);
 
+    const handleLoadMore = async () => {
+        if (!nextCursor) return;
+        pagesRef.current += 1;
+        setLoadingMore(true);
+        await fetchJobs();
+        setLoadingMore(false);
+    };
+
     useEffect(() => {
+        // fetchJobs changes with projectId: start over with the new project.
+        projectRef.current = projectId;
+        pagesRef.current = 1;
+        setJobs([]);
+        setNextCursor(null);
+        setLoading(true);
         fetchJobs();
         // Poll every 5 seconds for running jobs
         const interval = setInterval(fetchJobs, 5000);
         return () => clearInterval(interval);
-    }, [fetchJobs]);
+    }, [projectId, fetchJobs]);
 
     const handleViewJob = async (job: JobSummary) => {
         setSelectedJob(job);
@@ -228,6 +263,17 @@ export function JobsTab() {
                                 ))}
                             </tbody>
                         </table>
+                        {nextCursor && (
+                            <div className="flex justify-center pt-4">
+                                <Button
+                                    variant="secondary"
+                                    onClick={handleLoadMore}
+                                    disabled={loadingMore}
+                                >
+                                    {loadingMore ? <LoadingSpinner size="sm" /> : "Load More"}
+                                </Button>
+                            </div>
+                        )}
                     </div>
                 )}
             </Card>
@@ -17,6 +17,27 @@ celery_app = Celery(
 celery_app.conf.update(
     task_default_queue=celery_config.default_queue,
     worker_concurrency=celery_config.concurrency,
+    # Must match libs.py_core.celery_client; JSON is still accepted from
+    # clients that have not switched to msgpack yet.
+    task_serializer="msgpack",
+    result_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_accept_content=["msgpack", "json"],
+    # Task results are polled repeatedly by the API; compress them on the
+    # wire and let Redis expire them once the API has had time to persist.
+    result_compression="gzip",
+    result_expires=celery_config.result_expires,
+    result_extended=False,
+    # Generation tasks hold a GPU for minutes: only reserve one task per
+    # process and acknowledge after completion so a crashed worker re-queues
+    # its task instead of losing it.
+    worker_prefetch_multiplier=celery_config.prefetch_multiplier,
+    worker_max_tasks_per_child=celery_config.max_tasks_per_child,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # With late acks, Redis redelivers a task that stays unacked for longer
+    # than this; it must exceed the longest generation run.
+    broker_transport_options={"visibility_timeout": celery_config.visibility_timeout},
 )
 
 
@@ -10,6 +10,10 @@ class CeleryConfig:
     result_backend: str | None
     default_queue: str
     concurrency: int
+    result_expires: int
+    prefetch_multiplier: int
+    max_tasks_per_child: int | None
+    visibility_timeout: int
 
 
 def get_celery_config() -> CeleryConfig:
@@ -20,6 +24,9 @@ def get_celery_config() -> CeleryConfig:
     - CELERY_BROKER_URL (recommended)
     - JOB_QUEUE_URL (fallback)
     - redis://localhost:6379/1 (dev default)
+
+    Worker concurrency reads CELERY_WORKER_CONCURRENCY, falling back to the
+    legacy WORKER_CONCURRENCY.
     """
     broker_url = (
         os.getenv("CELERY_BROKER_URL")
@@ -28,12 +35,25 @@ def get_celery_config() -> CeleryConfig:
     )
     result_backend = os.getenv("CELERY_RESULT_BACKEND") or broker_url
     default_queue = os.getenv("CELERY_DEFAULT_QUEUE", "steadydancer")
-    concurrency = int(os.getenv("WORKER_CONCURRENCY", "4"))
+    concurrency = int(
+        os.getenv("CELERY_WORKER_CONCURRENCY")
+        or os.getenv("WORKER_CONCURRENCY")
+        or "4"
+    )
+    result_expires = int(os.getenv("CELERY_RESULT_EXPIRES", "86400"))
+    prefetch_multiplier = int(os.getenv("CELERY_WORKER_PREFETCH_MULTIPLIER", "1"))
+    max_tasks_raw = os.getenv("CELERY_WORKER_MAX_TASKS_PER_CHILD")
+    max_tasks_per_child = int(max_tasks_raw) if max_tasks_raw else None
+    visibility_timeout = int(os.getenv("CELERY_VISIBILITY_TIMEOUT", "3600"))
 
     return CeleryConfig(
         broker_url=broker_url,
         result_backend=result_backend,
         default_queue=default_queue,
         concurrency=concurrency,
+        result_expires=result_expires,
+        prefetch_multiplier=prefetch_multiplier,
+        max_tasks_per_child=max_tasks_per_child,
+        visibility_timeout=visibility_timeout,
     )
 
@@ -3,6 +3,9 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
+import orjson
+from pydantic import BaseModel, ConfigDict
+
 from apps.worker.celery_app import celery_app
 from libs.py_core.models.steadydancer_cli import (
     SteadyDancerI2VRequest,
@@ -13,9 +16,38 @@ from libs.py_core.models.steadydancer_preprocess import (
     run_preprocess_pipeline,
 )
 from libs.py_core.projects import ensure_experiment_dirs, ensure_job_dirs
-import json
+from libs.py_core.steadydancer_prompts import get_prompt_template
+
 
+class GenerateI2VPayload(BaseModel):
+    """
+    Validated view of the I2V task payload sent by the API.
 
+    Defaults mirror SteadyDancerJobCreate; unknown keys are ignored so the API
+    can add fields ahead of worker deployments.
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    input_dir: Path
+    prompt_override: str | None = None
+    prompt_key: str | None = None
+    size: str = "1024*576"
+    frame_num: int = 81
+    sample_guide_scale: float = 5.0
+    condition_guide_scale: float = 1.0
+    end_cond_cfg: float = 0.4
+    base_seed: int = -1
+    sample_steps: int | None = None
+    sample_shift: float | None = None
+    sample_solver: str | None = None
+    offload_model: bool | None = None
+    cuda_visible_devices: str | None = None
+    project_id: str | None = None
+    job_id: str | None = None
+
+
+# acks_late / reject_on_worker_lost come from the worker-wide config.
 @celery_app.task(name="steadydancer.generate.i2v")
 def generate_i2v_task(payload: dict[str, Any]) -> dict[str, Any]:
     """
@@ -24,6 +56,7 @@ def generate_i2v_task(payload: dict[str, Any]) -> dict[str, Any]:
     Expected payload structure (all paths absolute or repo-root-relative):
     - input_dir: str  # directory containing ref_image.png, positive/, negative/, etc.
     - prompt_override: Optional[str]
+    - prompt_key?: Optional[str]  # "lang/style" template, used when prompt_override is unset
     - size: str
     - frame_num: int
     - sample_guide_scale: float
@@ -38,15 +71,17 @@ def generate_i2v_task(payload: dict[str, Any]) -> dict[str, Any]:
     - project_id?: str
     - job_id?: str
     """
-    input_dir = Path(payload["input_dir"])
+    parsed = GenerateI2VPayload.model_validate(payload)
+
+    prompt_override = parsed.prompt_override
+    if prompt_override is None and parsed.prompt_key is not None:
+        prompt_override = get_prompt_template(parsed.prompt_key)
 
-    project_id = payload.get("project_id")
-    job_id = payload.get("job_id")
     job_paths = None
     output_dir: Path | None = None
-    if project_id is not None and job_id is not None:
+    if parsed.project_id is not None and parsed.job_id is not None:
         try:
-            job_paths = ensure_job_dirs(project_id=project_id, job_id=job_id)
+            job_paths = ensure_job_dirs(project_id=parsed.project_id, job_id=parsed.job_id)
             output_dir = job_paths.output_dir
         except Exception:
             # Best-effort; failures here must not break inference.
@@ -54,26 +89,20 @@ def generate_i2v_task(payload: dict[str, Any]) -> dict[str, Any]:
             output_dir = None
 
     req = SteadyDancerI2VRequest(
-        input_dir=input_dir,
+        input_dir=parsed.input_dir,
         output_dir=output_dir,
-        prompt_override=payload.get("prompt_override"),
-        size=payload.get("size", "1024*576"),
-        frame_num=int(payload.get("frame_num", 81)),
-        sample_guide_scale=float(payload.get("sample_guide_scale", 5.0)),
-        condition_guide_scale=float(payload.get("condition_guide_scale", 1.0)),
-        end_cond_cfg=float(payload.get("end_cond_cfg", 0.4)),
-        base_seed=int(payload.get("base_seed", -1)),
-        sample_steps=(
-            int(payload["sample_steps"]) if "sample_steps" in payload and payload["sample_steps"] is not None else None
-        ),
-        sample_shift=(
-            float(payload["sample_shift"])
-            if "sample_shift" in payload and payload["sample_shift"] is not None
-            else None
-        ),
-        sample_solver=payload.get("sample_solver"),
-        offload_model=payload.get("offload_model"),
-        cuda_visible_devices=payload.get("cuda_visible_devices"),
+        prompt_override=prompt_override,
+        size=parsed.size,
+        frame_num=parsed.frame_num,
+        sample_guide_scale=parsed.sample_guide_scale,
+        condition_guide_scale=parsed.condition_guide_scale,
+        end_cond_cfg=parsed.end_cond_cfg,
+        base_seed=parsed.base_seed,
+        sample_steps=parsed.sample_steps,
+        sample_shift=parsed.sample_shift,
+        sample_solver=parsed.sample_solver,
+        offload_model=parsed.offload_model,
+        cuda_visible_devices=parsed.cuda_visible_devices,
     )
 
     result = run_i2v_generation(req)
@@ -81,21 +110,20 @@ def generate_i2v_task(payload: dict[str, Any]) -> dict[str, Any]:
     # Persist result and payload snapshot under the job's logs directory, if available.
     if job_paths is not None:
         try:
-            logs_dir = job_paths.logs_dir
-            logs_dir.mkdir(parents=True, exist_ok=True)
-
-            log_path = logs_dir / "i2v_result.json"
-            payload_snapshot = dict(payload)
+            # logs_dir was created by ensure_job_dirs above.
+            log_path = job_paths.logs_dir / "i2v_result.json"
             # Avoid accidentally persisting very large values in the payload snapshot.
-            payload_snapshot.pop("input_dir", None)
+            payload_snapshot = {k: v for k, v in payload.items() if k != "input_dir"}
 
             log_content = {
                 "payload": payload_snapshot,
                 "result": result.to_dict(),
             }
-            log_path.write_text(
-                json.dumps(log_content, indent=2, ensure_ascii=False),
-                encoding="utf-8",
+            log_path.write_bytes(
+                orjson.dumps(
+                    log_content,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                )
             )
         except Exception:
             # Logging is best-effort and must never break task execution.
@@ -104,6 +132,8 @@ def generate_i2v_task(payload: dict[str, Any]) -> dict[str, Any]:
     return result.to_dict()
 
 
+# The result is stored: experiments expose preprocess_task_id, which clients
+# poll through GET /steadydancer/jobs/{task_id}.
 @celery_app.task(name="steadydancer.preprocess.experiment")
 def preprocess_experiment_task(payload: dict[str, Any]) -> dict[str, Any]:
     """
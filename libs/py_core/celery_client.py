@@ -23,3 +23,21 @@ celery_client = Celery(
     backend=result_backend,
 )
 
+# Payloads are small dicts of paths and numeric knobs; msgpack is more compact
+# and cheaper to (de)serialize than JSON. JSON stays accepted so results and
+# tasks from older peers remain readable.
+celery_client.conf.update(
+    task_serializer="msgpack",
+    result_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_accept_content=["msgpack", "json"],
+    # Compression is applied by whoever sends the message: task bodies here,
+    # results on the worker (see apps.worker.celery_app).
+    task_compression="gzip",
+    # Keep in sync with the worker: with late acks, an unacked task is
+    # redelivered once this many seconds pass, so it must exceed the
+    # longest generation run.
+    broker_transport_options={
+        "visibility_timeout": int(os.getenv("CELERY_VISIBILITY_TIMEOUT", "3600")),
+    },
+)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 from pathlib import Path
@@ -7,13 +8,20 @@ from typing import Union
 from uuid import UUID
 
 
+# Layout: libs/py_core/projects.py -> libs/py_core -> libs -> <repo_root>
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Default data root, relative to the repo root, when no env override is set.
+_DEFAULT_DATA_SUBDIR = "data"
+
+
 def _get_repo_root() -> Path:
     """
     Infer the repository root based on this file's location.
 
-    Layout: libs/py_core/projects.py -> libs/py_core -> libs -> <repo_root>
+    Computed once at import time; the source tree does not move at runtime.
     """
-    return Path(__file__).resolve().parents[3]
+    return _REPO_ROOT
 
 
 def get_repo_root() -> Path:
@@ -23,6 +31,7 @@ def get_repo_root() -> Path:
     return _get_repo_root()
 
 
+@functools.lru_cache(maxsize=1)
 def get_data_root() -> Path:
     """
     Return the root directory for SteadyDancer project/job data.
@@ -31,13 +40,16 @@ def get_data_root() -> Path:
     - If STEADYDANCER_DATA_DIR is set, use it as-is;
     - Else if DATA_DIR is set, use it as-is;
     - Otherwise, default to <repo_root>/data.
+
+    The result is cached for the lifetime of the process; call
+    get_data_root.cache_clear() after changing the environment.
     """
     env_value = os.getenv("STEADYDANCER_DATA_DIR") or os.getenv("DATA_DIR")
     if env_value:
         return Path(env_value).expanduser().resolve()
 
     repo_root = _get_repo_root()
-    return (repo_root / "data").resolve()
+    return (repo_root / _DEFAULT_DATA_SUBDIR).resolve()
 
 
 def resolve_repo_relative(path: Union[Path, str]) -> Path:
@@ -55,12 +67,16 @@ def resolve_repo_relative(path: Union[Path, str]) -> Path:
     return (base / p).expanduser().resolve()
 
 
+@functools.lru_cache(maxsize=4096)
 def to_data_relative(path: Union[Path, str]) -> str:
     """
     Convert an absolute path under the data root into a relative path.
 
     - If `path` is under get_data_root(), return a POSIX-style relative path;
     - Otherwise, return the original path string unchanged.
+
+    Results are memoized per input, since the data root is process-global and
+    job paths never change once created.
     """
     base = get_data_root()
     p = Path(path).expanduser().resolve()
@@ -71,12 +87,15 @@ def to_data_relative(path: Union[Path, str]) -> str:
         return str(p)
 
 
+@functools.lru_cache(maxsize=4096)
 def from_data_relative(path_str: str) -> Path:
     """
     Resolve a path string stored in the DB into an absolute filesystem path.
 
     - If `path_str` is absolute, return it as-is;
     - Otherwise, treat it as relative to get_data_root().
+
+    Results are memoized per input (see to_data_relative).
     """
     p = Path(path_str)
     if p.is_absolute():
@@ -84,12 +103,15 @@ def from_data_relative(path_str: str) -> Path:
     return (get_data_root() / p).resolve()
 
 
+@functools.lru_cache(maxsize=1)
 def get_tmp_root() -> Path:
     """
     Return the root directory for SteadyDancer temporary files.
 
     - If STEADYDANCER_TMP_DIR is set, use it as-is;
     - Otherwise, default to <data_root>/tmp.
+
+    Cached like get_data_root().
     """
     env_value = os.getenv("STEADYDANCER_TMP_DIR")
     if env_value:
@@ -98,7 +120,7 @@ def get_tmp_root() -> Path:
     return get_data_root() / "tmp"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class JobPaths:
     """
     Resolved filesystem paths for a single job.
@@ -115,7 +137,7 @@ class JobPaths:
     logs_dir: Path
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReferencePaths:
     """
     Resolved filesystem paths for a single reference asset.
@@ -132,7 +154,7 @@ class ReferencePaths:
     meta_path: Path
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MotionPaths:
     """
     Resolved filesystem paths for a single motion asset.
@@ -149,7 +171,7 @@ class MotionPaths:
     meta_path: Path
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExperimentPaths:
     """
     Resolved filesystem paths for a single experiment.
@@ -166,24 +188,35 @@ class ExperimentPaths:
     config_path: Path
 
 
-def _normalize_uuid(value: Union[UUID, str]) -> str:
-    if isinstance(value, UUID):
-        return str(value)
-    return str(value)
+def _batch_mkdir(leaves: tuple[Path, ...]) -> None:
+    """
+    Create sibling leaf directories that share a parent.
+
+    Leaves are created in order, so if the last one already exists the
+    layout is complete and a single stat is enough (e.g. task retries).
+    Otherwise only the first leaf creates missing ancestors; the rest are
+    plain single-level mkdirs.
+    """
+    if leaves[-1].is_dir():
+        return
+    first, *rest = leaves
+    first.mkdir(parents=True, exist_ok=True)
+    for path in rest:
+        path.mkdir(exist_ok=True)
 
 
 def get_project_root(project_id: Union[UUID, str]) -> Path:
     """
     Compute the root directory for a given project.
     """
-    return get_data_root() / "projects" / _normalize_uuid(project_id)
+    return get_data_root() / "projects" / str(project_id)
 
 
 def get_job_root(project_id: Union[UUID, str], job_id: Union[UUID, str]) -> Path:
     """
     Compute the root directory for a given job under a project.
     """
-    return get_project_root(project_id) / "jobs" / _normalize_uuid(job_id)
+    return get_project_root(project_id) / "jobs" / str(job_id)
 
 
 def ensure_job_dirs(project_id: Union[UUID, str], job_id: Union[UUID, str]) -> JobPaths:
@@ -205,8 +238,7 @@ def ensure_job_dirs(project_id: Union[UUID, str], job_id: Union[UUID, str]) -> J
     tmp_dir = job_root / "tmp"
     logs_dir = job_root / "logs"
 
-    for path in (project_root, job_root, input_dir, output_dir, tmp_dir, logs_dir):
-        path.mkdir(parents=True, exist_ok=True)
+    _batch_mkdir((input_dir, output_dir, tmp_dir, logs_dir))
 
     return JobPaths(
         project_root=project_root,
@@ -222,7 +254,7 @@ def get_reference_root(project_id: Union[UUID, str], ref_id: Union[UUID, str]) -
     """
     Compute the root directory for a reference asset within a project.
     """
-    return get_project_root(project_id) / "refs" / _normalize_uuid(ref_id)
+    return get_project_root(project_id) / "refs" / str(ref_id)
 
 
 def ensure_reference_dirs(
@@ -237,8 +269,7 @@ def ensure_reference_dirs(
     source_dir = ref_root / "source"
     meta_path = ref_root / "meta.json"
 
-    for path in (project_root, ref_root, source_dir):
-        path.mkdir(parents=True, exist_ok=True)
+    _batch_mkdir((source_dir,))
 
     return ReferencePaths(
         project_root=project_root,
@@ -252,7 +283,7 @@ def get_motion_root(project_id: Union[UUID, str], motion_id: Union[UUID, str]) -
     """
     Compute the root directory for a motion asset within a project.
     """
-    return get_project_root(project_id) / "motions" / _normalize_uuid(motion_id)
+    return get_project_root(project_id) / "motions" / str(motion_id)
 
 
 def ensure_motion_dirs(
@@ -267,8 +298,7 @@ def ensure_motion_dirs(
     source_dir = motion_root / "source"
     meta_path = motion_root / "meta.json"
 
-    for path in (project_root, motion_root, source_dir):
-        path.mkdir(parents=True, exist_ok=True)
+    _batch_mkdir((source_dir,))
 
     return MotionPaths(
         project_root=project_root,
@@ -285,7 +315,7 @@ def get_experiment_root(
     """
     Compute the root directory for an experiment within a project.
     """
-    return get_project_root(project_id) / "experiments" / _normalize_uuid(experiment_id)
+    return get_project_root(project_id) / "experiments" / str(experiment_id)
 
 
 def ensure_experiment_dirs(
@@ -300,8 +330,7 @@ def ensure_experiment_dirs(
     input_dir = experiment_root / "input"
     config_path = experiment_root / "config.json"
 
-    for path in (project_root, experiment_root, input_dir):
-        path.mkdir(parents=True, exist_ok=True)
+    _batch_mkdir((input_dir,))
 
     return ExperimentPaths(
         project_root=project_root,
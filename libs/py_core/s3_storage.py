@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import functools
 import os
+import re
+import stat
 from dataclasses import dataclass
 from typing import Any, Optional, Tuple
+from urllib.parse import quote
 
 from pathlib import Path
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.auth import S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
 from botocore.config import Config as BotoConfig
+from botocore.credentials import Credentials
 from botocore.exceptions import BotoCoreError, NoCredentialsError
 
 
-@dataclass
+@dataclass(frozen=True)
 class S3Settings:
     """
     Thin wrapper around S3-related environment variables.
@@ -30,13 +38,30 @@ class S3Settings:
     addressing_style: str = "path"  # or "virtual"
 
 
+# Result videos are tens to hundreds of MB: upload them as parallel
+# multipart PUTs rather than boto3's more conservative defaults.
+_UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+
+_S3_URL_RE = re.compile(r"s3://([^/]+)/(.+)", re.DOTALL)
+
+
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
 def _read_bool_env(name: str, default: bool) -> bool:
     raw = os.getenv(name)
     if raw is None:
         return default
-    return raw.lower() in {"1", "true", "yes", "on"}
+    return raw.lower() in _TRUTHY
 
 
+@functools.lru_cache(maxsize=1)
 def get_s3_settings() -> Optional[S3Settings]:
     """
     Read S3 settings from environment variables.
@@ -51,6 +76,9 @@ def get_s3_settings() -> Optional[S3Settings]:
     - S3_REGION
     - S3_USE_SSL (default: true)
     - S3_ADDRESSING_STYLE ("path" or "virtual", default: "path")
+
+    The settings are read once per process; call get_s3_settings.cache_clear()
+    after changing the environment.
     """
     endpoint = os.getenv("S3_ENDPOINT")
     access_key = os.getenv("S3_ACCESS_KEY")
@@ -82,10 +110,19 @@ def is_s3_enabled() -> bool:
     return get_s3_settings() is not None
 
 
+@functools.lru_cache(maxsize=1)
 def _create_s3_client(settings: S3Settings):
+    """
+    Build (once per settings) an S3 client.
+
+    boto3 clients are thread-safe, so a single instance and its connection
+    pool are shared by all callers.
+    """
     session = boto3.session.Session()
     config = BotoConfig(
         s3={"addressing_style": settings.addressing_style},
+        # Match _get_presign_signer so both presign paths emit SigV4 URLs.
+        signature_version="s3v4",
         retries={"max_attempts": 3, "mode": "standard"},
     )
     return session.client(
@@ -110,13 +147,24 @@ def upload_file_to_s3(local_path: Path | str, key: str) -> str:
     if settings is None:
         raise RuntimeError("S3 is not configured (missing env vars).")
 
-    path = Path(local_path).expanduser().resolve()
-    if not path.is_file():
+    # A single stat is enough here; upload_file only needs a readable path, so
+    # skip resolve()'s per-component symlink walk.
+    path = os.path.expanduser(os.fspath(local_path))
+    try:
+        is_file = stat.S_ISREG(os.stat(path).st_mode)
+    except OSError:
+        is_file = False
+    if not is_file:
         raise FileNotFoundError(path)
 
     client = _create_s3_client(settings)
     try:
-        client.upload_file(str(path), settings.bucket_name, key)
+        client.upload_file(
+            path,
+            settings.bucket_name,
+            key,
+            Config=_UPLOAD_TRANSFER_CONFIG,
+        )
     except (BotoCoreError, NoCredentialsError) as exc:  # pragma: no cover - network errors
         raise RuntimeError(f"Failed to upload to S3: {exc}") from exc
 
@@ -127,15 +175,28 @@ def parse_s3_url(url: str) -> Tuple[str, str]:
     """
     Parse a simple s3://bucket/key URL into (bucket, key).
     """
-    if not url.startswith("s3://"):
-        raise ValueError(f"Not an s3 URL: {url}")
-
-    without_scheme = url[len("s3://") :]
-    parts = without_scheme.split("/", 1)
-    if len(parts) != 2 or not parts[0] or not parts[1]:
+    m = _S3_URL_RE.fullmatch(url)
+    if m is None:
+        if not url.startswith("s3://"):
+            raise ValueError(f"Not an s3 URL: {url}")
         raise ValueError(f"Invalid s3 URL: {url}")
-    bucket, key = parts
-    return bucket, key
+    return m.group(1), m.group(2)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_presign_signer(settings: S3Settings, expires_in: int) -> S3SigV4QueryAuth:
+    """
+    Build (once per settings / expiry) a SigV4 query-string signer.
+
+    Signing a GET URL this way skips the client's request serialization and
+    event hooks; it produces the same URL as client.generate_presigned_url().
+    """
+    return S3SigV4QueryAuth(
+        Credentials(settings.access_key, settings.secret_key),
+        "s3",
+        settings.region_name or "us-east-1",
+        expires=expires_in,
+    )
 
 
 def generate_presigned_get_url(url: str, expires_in: int = 3600) -> str:
@@ -147,6 +208,20 @@ def generate_presigned_get_url(url: str, expires_in: int = 3600) -> str:
         raise RuntimeError("S3 is not configured (missing env vars).")
 
     bucket, key = parse_s3_url(url)
+
+    # Path-style URLs are signed locally; virtual-hosted addressing depends on
+    # botocore's endpoint rules, so leave that to the client.
+    if settings.addressing_style == "path" and settings.endpoint_url:
+        request = AWSRequest(
+            method="GET",
+            url=f"{settings.endpoint_url.rstrip('/')}/{bucket}/{quote(key, safe='/~')}",
+        )
+        try:
+            _get_presign_signer(settings, expires_in).add_auth(request)
+        except BotoCoreError as exc:
+            raise RuntimeError(f"Failed to generate presigned URL: {exc}") from exc
+        return request.url
+
     client = _create_s3_client(settings)
     try:
         return client.generate_presigned_url(
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import sys
+from types import MappingProxyType
+from typing import Mapping
+
 """
 Predefined SteadyDancer prompt templates.
 
-These templates are not wired into the main generation flow yet, but can be
+Jobs can select one via `prompt_key` ("lang/style"); they can also be
 referenced by API / Worker / Web to provide consistent default styles.
 
 Design原则：
@@ -58,3 +62,27 @@ STEADYDANCER_PROMPT_EN_STYLIZED = (
 DEFAULT_PROMPT_ZH = STEADYDANCER_PROMPT_ZH_REALISTIC
 DEFAULT_PROMPT_EN = STEADYDANCER_PROMPT_EN_REALISTIC
 
+
+# (lang, style) -> template, e.g. PROMPT_TEMPLATES[("en", "stage")].
+# Strings are interned so callers routing on a template get identity-equal
+# objects across modules.
+PROMPT_TEMPLATES: Mapping[tuple[str, str], str] = MappingProxyType(
+    {
+        ("zh", "realistic"): sys.intern(STEADYDANCER_PROMPT_ZH_REALISTIC),
+        ("zh", "stage"): sys.intern(STEADYDANCER_PROMPT_ZH_STAGE),
+        ("zh", "stylized"): sys.intern(STEADYDANCER_PROMPT_ZH_STYLIZED),
+        ("en", "realistic"): sys.intern(STEADYDANCER_PROMPT_EN_REALISTIC),
+        ("en", "stage"): sys.intern(STEADYDANCER_PROMPT_EN_STAGE),
+        ("en", "stylized"): sys.intern(STEADYDANCER_PROMPT_EN_STYLIZED),
+    }
+)
+
+
+def get_prompt_template(prompt_key: str) -> str:
+    """
+    Look up a template by its "lang/style" key, e.g. "en/realistic".
+
+    Raises KeyError for unknown keys.
+    """
+    lang, _, style = prompt_key.partition("/")
+    return PROMPT_TEMPLATES[(lang, style)]
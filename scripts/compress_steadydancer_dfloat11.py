@@ -28,18 +28,35 @@ This will:
 - Write the compressed model into:
     <ckpt_dir>-df11  (e.g. models/SteadyDancer-14B-df11)
 
-The script is single-process and by default runs DFloat11's bit-exact
-correctness check on CUDA: this can be memory-heavy for 14B models.
-Pass --no-check-correctness to disable the check if you hit CUDA OOM.
+By default the script runs DFloat11's bit-exact correctness check on CUDA:
+this can be memory-heavy for 14B models. Pass --no-check-correctness to
+disable the check if you hit CUDA OOM, or --sample-check-frac to verify
+only a random fraction of modules one at a time. Without the full check,
+modules are encoded with a vectorized encoder, on the GPU when available
+and otherwise spread over --encode-workers processes.
+
+The diffusion backbone, T5 and CLIP are independent; --max-parallel runs
+several of them at once in separate processes (RAM and VRAM permitting;
+the default stays at 1 whenever a GPU is used). On
+multi-socket hosts each phase is pinned to one NUMA node (--no-numa-pin to
+disable).
 """
 
 import argparse
 import gc
+import json
+import multiprocessing
+import multiprocessing.connection
 import os
+import random
 import shutil
+import struct
 import sys
+import weakref
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Callable, Dict, Tuple
 
 import torch
 import torch.nn as nn
@@ -108,6 +125,40 @@ def _default_save_dir(ckpt_dir: Path, explicit: str | None) -> Path:
     return ckpt_dir.with_name(ckpt_dir.name + "-df11")
 
 
+def _fast_copy(src: Path | str, dst: Path | str) -> None:
+    """
+    Copy a single file, avoiding a byte copy when the filesystem allows it.
+
+    Tries, in order:
+      1. A reflink (FICLONE ioctl) on copy-on-write filesystems (btrfs, XFS);
+      2. A hardlink when src and dst are on the same device – the DF11
+         directory is treated as read-only, so sharing the inode is safe;
+      3. shutil.copy2.
+    """
+    src = Path(src)
+    dst = Path(dst)
+
+    try:
+        import fcntl
+
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), fcntl.FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+        return
+    except (ImportError, AttributeError, OSError):
+        # Not Linux or not a CoW filesystem; drop the empty file left behind.
+        dst.unlink(missing_ok=True)
+
+    if src.stat().st_dev == dst.parent.stat().st_dev:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
+
+
 def _copy_auxiliary_files(src: Path, dst: Path) -> None:
     """
     Copy non-weight assets (tokenizer files, configs, README, etc.)
@@ -123,6 +174,8 @@ def _copy_auxiliary_files(src: Path, dst: Path) -> None:
       - 原始 config.json（DF11 会写入自己的 config.json，仅包含 dfloat11_config）。
       - Hidden lock/cursor directories (e.g. .lock) that are only used by
         download tools.
+
+    Files are reflinked or hardlinked where possible (see _fast_copy).
     """
     dst.mkdir(parents=True, exist_ok=True)
 
@@ -152,11 +205,11 @@ def _copy_auxiliary_files(src: Path, dst: Path) -> None:
         if item.is_dir():
             if dest.exists():
                 continue
-            shutil.copytree(item, dest)
+            shutil.copytree(item, dest, copy_function=_fast_copy)
         else:
             if dest.exists():
                 continue
-            shutil.copy2(item, dest)
+            _fast_copy(item, dest)
 
 
 def _import_dfloat11(repo_root: Path):
@@ -193,7 +246,8 @@ def _load_wan_model(ckpt_dir: Path) -> nn.Module:
     Load the Wan diffusion backbone (WanModel) from a local checkpoint dir.
 
     This mirrors the upstream WanI2VDancer behavior, but only instantiates
-    the transformer backbone. All weights are loaded on CPU in bfloat16.
+    the transformer backbone. All weights are loaded on CPU in bfloat16,
+    directly from the safetensors shards.
     """
     repo_root = _get_repo_root()
     _get_steady_repo(repo_root)
@@ -209,41 +263,128 @@ def _load_wan_model(ckpt_dir: Path) -> nn.Module:
         ) from exc
 
     print(f"[DF11] Loading WanModel.from_pretrained from {ckpt_dir} ...")
+    # low_cpu_mem_usage builds the model on meta and fills it straight from
+    # the safetensors shards in bfloat16, instead of materializing
+    # randomly-initialized parameters first.
     model = WanModel.from_pretrained(
         str(ckpt_dir),
         torch_dtype=torch.bfloat16,
-        low_cpu_mem_usage=False,
+        low_cpu_mem_usage=True,
+        use_safetensors=True,
     )
     model.eval()
-    # Ensure all Linear/Embedding weights are in bfloat16 for DFloat11.
-    model.to(torch.bfloat16)
+    # Ensure all Linear/Embedding weights are in bfloat16 for DFloat11 (e.g.
+    # if some modules were kept in FP32 on load).
+    if any(p.dtype != torch.bfloat16 for p in model.parameters()):
+        model.to(torch.bfloat16)
     return model
 
 
-def _build_pattern_dict(root_module: nn.Module) -> Dict[str, Tuple[str, ...]]:
+def _load_checkpoint_into(
+    build_model: Callable[[str], nn.Module],
+    ckpt_path: Path,
+) -> nn.Module:
     """
-    Automatically build a DFloat11 pattern_dict for WanModel.
+    Instantiate a model with `build_model(device)` and load `ckpt_path` into it.
 
-    Strategy:
-      - Treat every nn.Linear / nn.Embedding under the root module as a
-        separate DF11 block.
-      - Use the fully-qualified module name as the regex pattern.
-      - For simple Linear/Embedding modules, DFloat11 ignores attr_names
-        and directly compresses the module's own `weight`.
+    The checkpoint is memory-mapped (safe_open for .safetensors,
+    torch.load(mmap=True) for .pth) and assigned into a model built on the
+    meta device, so the weights are never held twice in RAM. Falls back to
+    building on CPU and copying if the mmap or meta path is not possible
+    (legacy non-zip .pth, or state the checkpoint does not cover).
     """
-    pattern_dict: Dict[str, Tuple[str, ...]] = {}
+    if ckpt_path.suffix == ".safetensors":
+        from safetensors import safe_open
+
+        with safe_open(str(ckpt_path), framework="pt", device="cpu") as f:
+            state_dict = {k: f.get_tensor(k) for k in f.keys()}
+    else:
+        # weights_only: these are plain state dicts, so use the restricted
+        # unpickler (faster, and never executes code from the checkpoint).
+        try:
+            state_dict = torch.load(
+                ckpt_path, map_location="cpu", mmap=True, weights_only=True
+            )
+        except RuntimeError:
+            # Legacy (pre-zipfile) checkpoints cannot be memory-mapped.
+            state_dict = torch.load(ckpt_path, map_location="cpu", weights_only=True)
+
+    try:
+        model = build_model("meta")
+        model.load_state_dict(state_dict, assign=True)
+        leftover = [
+            name
+            for name, t in (*model.named_parameters(), *model.named_buffers())
+            if t.is_meta
+        ]
+        if leftover:
+            raise RuntimeError(f"not covered by the checkpoint: {', '.join(leftover[:5])}")
+    except Exception as exc:
+        print(f"[DF11] Meta-device load unavailable ({exc}); loading on CPU instead.")
+        model = build_model("cpu")
+        model.load_state_dict(state_dict)
 
-    for name, module in root_module.named_modules():
-        if isinstance(module, (nn.Linear, nn.Embedding)):
-            pattern_dict[name] = ()
+    # state_dict no longer needed once loaded into the model.
+    del state_dict
+    gc.collect()
+    return model
+
+
+_DF11_TARGETS: weakref.WeakKeyDictionary[nn.Module, Tuple[Tuple[str, nn.Module], ...]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _enumerate_df11_targets(root_module: nn.Module) -> Tuple[Tuple[str, nn.Module], ...]:
+    """
+    Return every (name, module) under `root_module` that DF11 can compress,
+    i.e. nn.Linear / nn.Embedding, in named_modules() order.
+
+    Memoized per root module, so target selection and compression share one
+    walk of the (thousands of modules deep) model tree.
+    """
+    targets = _DF11_TARGETS.get(root_module)
+    if targets is None:
+        targets = tuple(
+            (name, module)
+            for name, module in root_module.named_modules()
+            if isinstance(module, (nn.Linear, nn.Embedding))
+        )
+        _DF11_TARGETS[root_module] = targets
+    return targets
+
+
+def _build_target_names(root_module: nn.Module) -> set[str]:
+    """
+    Collect the names of the modules to DF11-compress under root_module.
+
+    Every nn.Linear / nn.Embedding is treated as a separate DF11 block and is
+    identified by its fully-qualified module name.
+    """
+    target_names = {name for name, _ in _enumerate_df11_targets(root_module)}
 
-    if not pattern_dict:
+    if not target_names:
         raise RuntimeError(
             "No Linear/Embedding modules found under WanModel; nothing to compress."
         )
 
-    print(f"[DF11] Will compress {len(pattern_dict)} Linear/Embedding modules.")
-    return pattern_dict
+    print(f"[DF11] Will compress {len(target_names)} Linear/Embedding modules.")
+    return target_names
+
+
+def _as_pattern_dict(root_module: nn.Module, target_names: set[str]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Materialize DFloat11's pattern_dict for `target_names`, in module order.
+
+    Module names serve as (exact) regex patterns; for simple Linear/Embedding
+    modules DFloat11 ignores attr_names and compresses the module's own
+    `weight`, hence the empty tuples.
+    """
+    return {
+        name: ()
+        for name, _ in _enumerate_df11_targets(root_module)
+        if name in target_names
+    }
 
 
 def _override_threads_per_block(dfloat11_module, threads_per_block: int | None) -> None:
@@ -272,9 +413,11 @@ def _patch_dfloat11_get_luts(dfloat11_module) -> None:
     Monkey-patch dfloat11.get_luts to avoid the UnboundLocalError in the
     upstream implementation (curr_val referenced before assignment).
 
-    The logic is copied from dfloat11_utils.get_luts, with one fix:
-    - Initialize curr_val for each LUT row so that even if a byte value
-      is not present in bytes_dict, we never read an undefined variable.
+    The output matches dfloat11_utils.get_luts, with two differences:
+    - curr_val for each LUT row is seeded with the first value inserted for
+      that prefix, so we never read an undefined variable;
+    - prefix / byte enumeration is done with NumPy bit arithmetic instead of
+      per-code binary strings, and the per-prefix debug print is dropped.
     """
     try:
         import dfloat11.dfloat11 as df11_internal  # type: ignore[import]
@@ -285,55 +428,78 @@ def _patch_dfloat11_get_luts(dfloat11_module) -> None:
     import torch as _torch
 
     def _safe_get_luts(table):
-        prefixes = [""]
-
-        for key, (bits, val) in table.items():
-            if isinstance(key, int):
-                prefix = bin(val)[2:].rjust(bits, "0")[: ((bits - 1) // 8 * 8)]
-                if prefix not in prefixes:
-                    prefixes.append(prefix)
-
-        prefixes.sort(key=len)
-
-        luts = _np.zeros((len(prefixes), 256), dtype=_np.uint8)
-
-        for pi, p in enumerate(prefixes):
-            bytes_dict = {}
-            pl = len(p) // 8
-            for key, (bits, val) in table.items():
-                if isinstance(key, int):
-                    bin_val = bin(val)[2:].rjust(bits, "0")
-
-                    if bin_val.startswith(p):
-                        if (bits - 1) // 8 == pl:
-                            dict_key = int(bin_val[(pl * 8) :].ljust(8, "0"), 2)
-                            dict_value = key
-                        else:
-                            dict_key = int(bin_val[(pl * 8) : (pl * 8 + 8)], 2)
-                            dict_value = 256 - prefixes.index(bin_val[: (pl * 8 + 8)])
-
-                        if dict_key in bytes_dict and bytes_dict[dict_key] != dict_value:
-                            raise ValueError(f"Key {dict_key} already exists in {bytes_dict}")
-                        else:
-                            bytes_dict[dict_key] = dict_value
-
-            # Upstream implementation prints bytes_dict; keep for debugging.
-            print(bytes_dict)
-
-            # FIX: ensure curr_val is always initialized, even if bytes_dict is empty
-            # or if the first few byte values are not present.
-            curr_val = next(iter(bytes_dict.values()), 0)
-            for i in range(256):
-                if i in bytes_dict:
-                    curr_val = bytes_dict[i]
-                luts[pi, i] = curr_val
-
-        lens = _np.zeros((1, 256), dtype=_np.uint8)
-        for key, (bits, val) in table.items():
-            if isinstance(key, int):
-                lens[-1, key] = bits
-
-        return _torch.from_numpy(_np.concatenate((luts, lens), axis=0))
+        items = [(key, bits, val) for key, (bits, val) in table.items() if isinstance(key, int)]
+        keys = _np.fromiter((k for k, _, _ in items), dtype=_np.int64, count=len(items))
+        bits = _np.fromiter((b for _, b, _ in items), dtype=_np.int64, count=len(items))
+        vals = _np.fromiter((v for _, _, v in items), dtype=_np.int64, count=len(items))
+
+        # A prefix is identified by (length in bits, value); pack both into one
+        # int64 so prefixes can be deduplicated and looked up with searchsorted.
+        def _prefix_id(length, value):
+            return (length << 40) | value
+
+        # Each code's prefix: its leading whole bytes, excluding the last byte.
+        code_plen = (bits - 1) // 8 * 8
+        code_pid = _prefix_id(code_plen, vals >> (bits - code_plen))
+
+        # Unique prefixes in first-seen order, "" first, then stable-sorted by
+        # length (mirrors `prefixes.append(...)` + `prefixes.sort(key=len)`).
+        uniq, first_idx = _np.unique(code_pid, return_index=True)
+        uniq = uniq[_np.argsort(first_idx, kind="stable")]
+        uniq = uniq[uniq != _prefix_id(0, 0)]
+        prefix_ids = _np.concatenate(([_prefix_id(0, 0)], uniq))
+        prefix_ids = prefix_ids[_np.argsort(prefix_ids >> 40, kind="stable")]
+        prefix_order = _np.argsort(prefix_ids)
+        sorted_prefix_ids = prefix_ids[prefix_order]
+
+        # One buffer for the whole result: a LUT row per prefix, then the
+        # code-length row. Zero-filled, as rows of unused prefixes and lengths
+        # of absent symbols stay 0.
+        out = _torch.zeros((len(prefix_ids) + 1, 256), dtype=_torch.uint8)
+        out_np = out.numpy()
+        luts = out_np[:-1]
+        byte_positions = _np.arange(256)
+
+        for pi, pid in enumerate(prefix_ids.tolist()):
+            plen = pid >> 40
+            pval = pid & ((1 << 40) - 1)
+            pl = plen // 8
+
+            match = (bits >= plen) & ((vals >> _np.maximum(bits - plen, 0)) == pval)
+            m_bits = bits[match]
+            m_vals = vals[match]
+            if m_bits.size == 0:
+                continue
+
+            # Codes ending within the next byte map to their symbol; longer
+            # codes map to "256 - index" of their next (plen + 8)-bit prefix.
+            ends_here = (m_bits - 1) // 8 == pl
+            rest = m_bits - plen
+            dict_keys = _np.where(
+                ends_here,
+                (m_vals & ((1 << rest) - 1)) << _np.maximum(8 - rest, 0),
+                (m_vals >> _np.maximum(rest - 8, 0)) & 0xFF,
+            )
+            next_pid = _prefix_id(plen + 8, m_vals >> _np.maximum(rest - 8, 0))
+            pos = _np.searchsorted(sorted_prefix_ids, next_pid)
+            pos = _np.minimum(pos, len(sorted_prefix_ids) - 1)
+            found = sorted_prefix_ids[pos] == next_pid
+            if not _np.all(found | ends_here):
+                raise ValueError("Huffman code references a prefix that is not in the table")
+            dict_values = _np.where(ends_here, keys[match], 256 - prefix_order[pos])
+
+            dense = _np.full(256, -1, dtype=_np.int64)
+            dense[dict_keys] = dict_values
+            if not _np.array_equal(dense[dict_keys], dict_values):
+                raise ValueError(f"Conflicting LUT entries for prefix {pi}")
+
+            # Carry the last seen value forward; positions before the first key
+            # take the first inserted value.
+            filled = _np.maximum.accumulate(_np.where(dense >= 0, byte_positions, -1))
+            luts[pi] = _np.where(filled >= 0, dense[_np.maximum(filled, 0)], dict_values[0])
+
+        out_np[-1, keys] = bits
+        return out
 
     # Apply monkey patch.
     try:
@@ -344,59 +510,548 @@ def _patch_dfloat11_get_luts(dfloat11_module) -> None:
         print("[DF11] Warning: failed to patch dfloat11.get_luts; using upstream implementation.")
 
 
+def _exponent_histogram(weight: torch.Tensor) -> torch.Tensor:
+    """
+    Histogram of the 8-bit BF16 exponents of `weight` (256 bins).
+
+    Uses the same bit extraction as dfloat11_utils.get_codec, i.e.
+    `(W.view(int16) >> 7) & 0xFF`, so the bins line up with its counter.
+    """
+    exponent = ((weight.view(torch.int16) >> 7) & 0xFF).to(torch.uint8)
+    return torch.bincount(exponent.flatten(), minlength=256)
+
+
+def _min_compression_factor(histogram: torch.Tensor) -> float:
+    """
+    Lower bound (in %) on the DF11 compression factor of a weight, given its
+    _exponent_histogram().
+
+    No prefix code beats the entropy H of the exponents, and the sign/mantissa
+    byte is stored verbatim, so compressed / original >= (H / 8 + 1) / 2.
+    """
+    counts = histogram[histogram > 0].double()
+    p = counts / counts.sum()
+    entropy = float(-(p * torch.log2(p)).sum())
+    return (entropy / 8 + 1) / 2 * 100
+
+
+def _fast_bf16_counter(histogram: torch.Tensor) -> dict[int, int]:
+    """
+    Build the exponent counter dfloat11's get_32bit_codec expects from an
+    _exponent_histogram() result.
+
+    Equivalent to the counter returned by dfloat11_utils.get_codec (nonzero
+    bins only, ascending keys), without its torch.unique pass and the unused
+    HuffmanCodec it builds.
+    """
+    nonzero = torch.nonzero(histogram).flatten()
+    return dict(zip(nonzero.tolist(), histogram[nonzero].tolist()))
+
+
+def _df11_min_compressed_bytes(
+    histogram: torch.Tensor,
+    table: dict,
+    bytes_per_thread: int,
+    threads_per_block: int,
+) -> int:
+    """
+    Size of the DF11 buffers encode_weights would produce for a weight with
+    this _exponent_histogram(), computed from the codec's code-length table.
+
+    The bitstream, sign/mantissa and gaps sizes are exact; output_positions
+    may hold one more entry than counted (it depends on where the last code
+    starts), so the result is a lower bound that is at most 4 bytes short.
+    """
+    code_len = torch.zeros(256, dtype=torch.int64)
+    for symbol, (bits, _) in table.items():
+        if isinstance(symbol, int):
+            code_len[symbol] = bits
+
+    total_elems = int(histogram.sum())
+    total_bits = int((histogram * code_len).sum())
+    n_bytes = (total_bits + 7) // 8
+    blocks_per_grid = -(-n_bytes // (threads_per_block * bytes_per_thread))
+
+    encoded_bytes = n_bytes
+    sign_mantissa_bytes = total_elems
+    # One start index per block holding a code start, plus the end sentinel.
+    output_positions_bytes = blocks_per_grid * 4
+    # One 5-bit gap per thread of the launch grid.
+    gaps_bytes = (threads_per_block * blocks_per_grid * 5 + 7) // 8
+    return encoded_bytes + sign_mantissa_bytes + output_positions_bytes + gaps_bytes
+
+
+# Elements per step of _encode_weights_fast; bounds its scratch memory (about
+# 40 bytes per element on the encode device).
+_ENCODE_CHUNK_ELEMS = 1 << 24
+
+
+def _scatter_codes(
+    out: torch.Tensor,
+    starts: torch.Tensor,
+    lens: torch.Tensor,
+    vals: torch.Tensor,
+) -> None:
+    """
+    OR Huffman codes into the byte buffer `out` (MSB-first bitstream).
+
+    `starts` are bit offsets relative to the first byte of `out`. A code of at
+    most 32 bits spans at most 5 bytes; every bit belongs to exactly one code,
+    so adding the per-byte pieces is the same as OR-ing them.
+    """
+    first_byte = starts >> 3
+    window = vals << (40 - (starts & 7) - lens)
+    for j in range(5):
+        out.index_add_(0, first_byte + j, (window >> (32 - 8 * j)) & 0xFF)
+
+
+def _encode_weights_fast(
+    weights: list[torch.Tensor],
+    codec,
+    bytes_per_thread: int,
+    threads_per_block: int,
+    device: torch.device | str = "cpu",
+):
+    """
+    Vectorized drop-in for dfloat11_utils.encode_weights.
+
+    Produces bit-identical outputs, but lays out the Huffman bitstream, gaps
+    and output positions with tensor ops (cumsum + scatter) over chunks of
+    elements instead of a per-element Python loop. With a CUDA `device`, each
+    chunk of exponents is staged through pinned memory and encoded on the GPU.
+    """
+    import numpy as np
+
+    split_positions = torch.cumsum(
+        torch.LongTensor([w.numel() for w in weights]), dim=0
+    )[:-1]
+    w_combined = (weights[0] if len(weights) == 1 else torch.cat(weights)).view(torch.int16)
+
+    exponent_8bits = ((w_combined >> 7) & 0xFF).to(torch.uint8)
+    other_8bits = ((w_combined >> 8) & 0x80 | (w_combined & 0x7F)).to(torch.uint8)
+    n_elements = exponent_8bits.numel()
+
+    code_len = torch.zeros(256, dtype=torch.int64)
+    code_val = torch.zeros(256, dtype=torch.int64)
+    for symbol, (bits, val) in codec._table.items():
+        if isinstance(symbol, int):
+            code_len[symbol] = bits
+            code_val[symbol] = val
+    eof_len, eof_val = codec._table[codec._eof]
+
+    chunk_bits = 8 * bytes_per_thread
+    block_bits = chunk_bits * threads_per_block
+    if int(code_len.max()) > chunk_bits:
+        raise ValueError("Huffman codes longer than one thread's chunk are not supported")
+
+    total_bits = int((torch.bincount(exponent_8bits, minlength=256) * code_len).sum())
+    n_bytes = (total_bits + 7) // 8
+    encoded = torch.zeros(n_bytes + 5, dtype=torch.uint8)
+
+    device = torch.device(device)
+    dev_len = code_len.to(device)
+    dev_val = code_val.to(device)
+
+    gaps_parts: list[torch.Tensor] = []
+    position_parts: list[torch.Tensor] = []
+    bit_base = 0
+    prev_chunk = prev_block = -1
+    for lo in range(0, n_elements, _ENCODE_CHUNK_ELEMS):
+        symbols = exponent_8bits[lo : lo + _ENCODE_CHUNK_ELEMS]
+        if device.type == "cuda":
+            symbols = symbols.pin_memory().to(device, non_blocking=True)
+        symbols = symbols.long()
+
+        lens = dev_len[symbols]
+        ends = torch.cumsum(lens, 0) + bit_base
+        starts = ends - lens
+
+        # A thread chunk / block records the first code starting inside it
+        # (gap = that code's bit offset; position = its element index).
+        chunk_idx = starts // chunk_bits
+        first = torch.empty_like(chunk_idx, dtype=torch.bool)
+        first[0] = chunk_idx[0] != prev_chunk
+        first[1:] = chunk_idx[1:] != chunk_idx[:-1]
+        gaps_parts.append((starts[first] % chunk_bits).cpu())
+
+        block_idx = starts // block_bits
+        first[0] = block_idx[0] != prev_block
+        first[1:] = block_idx[1:] != block_idx[:-1]
+        position_parts.append(torch.nonzero(first).flatten().cpu() + lo)
+
+        byte_base = bit_base >> 3
+        chunk_end = int(ends[-1])
+        local = torch.zeros(
+            (chunk_end + 7) // 8 - byte_base + 5, dtype=torch.int64, device=device
+        )
+        _scatter_codes(local, starts - byte_base * 8, lens, dev_val[symbols])
+        # The first byte may already hold the tail of the previous chunk.
+        encoded[byte_base : byte_base + local.numel()] |= local.to(torch.uint8).cpu()
+
+        prev_chunk = int(chunk_idx[-1])
+        prev_block = int(block_idx[-1])
+        bit_base = chunk_end
+
+    gaps = torch.cat(gaps_parts) if gaps_parts else torch.zeros(0, dtype=torch.int64)
+    output_positions = (
+        torch.cat(position_parts) if position_parts else torch.zeros(0, dtype=torch.int64)
+    )
+
+    # A partial last byte is padded with the EOF code, which (like upstream)
+    # may open a new chunk / block of its own.
+    if total_bits % 8:
+        if total_bits // chunk_bits + 1 > gaps.numel():
+            gaps = torch.cat((gaps, torch.tensor([total_bits % chunk_bits])))
+        if total_bits // block_bits + 1 > output_positions.numel():
+            output_positions = torch.cat((output_positions, torch.tensor([n_elements])))
+        eof = torch.zeros(5, dtype=torch.int64)
+        _scatter_codes(
+            eof,
+            torch.tensor([total_bits % 8]),
+            torch.tensor([eof_len]),
+            torch.tensor([eof_val]),
+        )
+        encoded[total_bits // 8] |= eof[0].to(torch.uint8)
+    output_positions = torch.cat((output_positions, torch.tensor([n_elements])))
+
+    encoded = encoded[:n_bytes]
+    blocks_per_grid = -(-n_bytes // (threads_per_block * bytes_per_thread))
+    padded_gaps = np.zeros(max(threads_per_block * blocks_per_grid, gaps.numel()), dtype=np.uint8)
+    padded_gaps[: gaps.numel()] = gaps.numpy()
+    # Each gap is stored as 5 bits, MSB first.
+    gap_bits = (padded_gaps[:, None] >> np.arange(4, -1, -1, dtype=np.uint8)) & 1
+
+    return (
+        encoded,
+        other_8bits,
+        torch.from_numpy(output_positions.numpy().astype(np.uint32)),
+        torch.from_numpy(np.packbits(gap_bits.reshape(-1))),
+        split_positions,
+    )
+
+
+def _fast_replace_weight_with_df11_buffers(
+    sub_module: nn.Module, buffers: Dict[str, torch.Tensor]
+) -> None:
+    """
+    Equivalent of `delattr(sub_module, "weight")` followed by
+    `register_buffer(name, tensor)` for each DF11 buffer, writing the
+    module's parameter / buffer dicts directly.
+
+    Only valid for the Linear / Embedding targets of _selective_compress_model:
+    `weight` is a registered Parameter and the buffer names are fixed,
+    valid identifiers that clash with no existing attribute, so the checks
+    nn.Module performs on every call are redundant.
+    """
+    del sub_module._parameters["weight"]
+    sub_module._buffers.update(buffers)
+    # Persistent, so the buffers end up in state_dict() and the saved file.
+    sub_module._non_persistent_buffers_set.difference_update(buffers)
+
+
+def _verify_df11_module(
+    df11_internal,
+    full_name: str,
+    weight: torch.Tensor,
+    luts: torch.Tensor,
+    encoded: torch.Tensor,
+    other_8bits: torch.Tensor,
+    output_positions: torch.Tensor,
+    gaps: torch.Tensor,
+    *,
+    bytes_per_thread: int,
+    threads_per_block: int,
+) -> None:
+    """
+    Decode one DF11-encoded module on cuda:0 and compare it with `weight`.
+
+    Mirrors the per-module check in dfloat11.compress_model, but only the
+    module being verified is moved to the GPU and its VRAM is released
+    afterwards. Raises RuntimeError on mismatch.
+    """
+    import numpy as np
+
+    device = torch.device("cuda:0")
+
+    n_luts = luts.shape[0]
+    n_elements = other_8bits.numel()
+    n_bytes = encoded.numel()
+
+    cuda_luts, cuda_encoded, cuda_other_8bits, cuda_output_positions, cuda_gaps = (
+        t.to(device) for t in (luts, encoded, other_8bits, output_positions, gaps)
+    )
+    cuda_outputs = torch.empty(n_elements, dtype=torch.bfloat16, device=device)
+
+    blocks_per_grid = (int(np.ceil(n_bytes / (threads_per_block * bytes_per_thread))),)
+    positions = output_positions.view(torch.uint32).numpy()
+    shared_mem_size = (
+        threads_per_block * 4 + 4 + (positions[1:] - positions[:-1]).max().item() * 2
+    )
+
+    with df11_internal.cp.cuda.Device(device.index):
+        df11_internal._decode(
+            grid=blocks_per_grid,
+            block=(threads_per_block,),
+            shared_mem=shared_mem_size,
+            args=[
+                cuda_luts.data_ptr(),
+                cuda_encoded.data_ptr(),
+                cuda_other_8bits.data_ptr(),
+                cuda_output_positions.data_ptr(),
+                cuda_gaps.data_ptr(),
+                cuda_outputs.data_ptr(),
+                n_luts,
+                n_bytes,
+                n_elements,
+            ],
+        )
+
+    is_correct = torch.equal(weight.flatten(), cuda_outputs.cpu())
+
+    del cuda_luts, cuda_encoded, cuda_other_8bits, cuda_output_positions, cuda_gaps
+    del cuda_outputs
+    torch.cuda.empty_cache()
+
+    if not is_correct:
+        raise RuntimeError(
+            f"DF11 sampled check failed: decoded weights of '{full_name}' "
+            "do not match the original weights."
+        )
+    print(f"[DF11] Sampled check passed for module {full_name}.")
+
+
+def _encode_shared_weight(
+    shm_name: str,
+    numel: int,
+    codec,
+    bytes_per_thread: int,
+    threads_per_block: int,
+):
+    """
+    Process-pool entry point: DF11-encode one BF16 weight held in shared memory.
+
+    The weight is read zero-copy from the block named `shm_name`; the
+    encoder outputs are returned as NumPy arrays so only the (much smaller)
+    compressed data is pickled back to the parent.
+    """
+    import numpy as np
+
+    # The parent owns (and unlinks) the block; don't let this process's
+    # resource tracker claim it too.
+    shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    try:
+        weight = torch.from_numpy(
+            np.ndarray((numel,), dtype=np.int16, buffer=shm.buf)
+        ).view(torch.bfloat16)
+        outputs = _encode_weights_fast([weight], codec, bytes_per_thread, threads_per_block)
+        # Drop the view before close(): an exported buffer can't be released.
+        del weight
+        return tuple(t.numpy() for t in outputs)
+    finally:
+        shm.close()
+
+
+# safetensors dtype tags, in the order save_file lays tensors out (it sorts
+# by descending dtype, then by name).
+_SAFETENSORS_DTYPES: Dict[torch.dtype, str] = {
+    torch.bool: "BOOL",
+    torch.uint8: "U8",
+    torch.int8: "I8",
+    torch.int16: "I16",
+    torch.uint16: "U16",
+    torch.float16: "F16",
+    torch.bfloat16: "BF16",
+    torch.int32: "I32",
+    torch.uint32: "U32",
+    torch.float32: "F32",
+    torch.float64: "F64",
+    torch.int64: "I64",
+    torch.uint64: "U64",
+}
+_SAFETENSORS_DTYPE_RANK = {dtype: i for i, dtype in enumerate(_SAFETENSORS_DTYPES)}
+
+
+def _save_safetensors_streaming(tensors: Dict[str, torch.Tensor], path: str) -> None:
+    """
+    Write `tensors` as a safetensors file, streaming each tensor to disk.
+
+    safetensors.torch.save_file (0.7) first copies every tensor into a Python
+    bytes object, which for a whole DF11 model doubles peak RSS. Here the
+    header is built up front and each tensor is written straight from its own
+    storage, in the same layout save_file would produce.
+    """
+    items = sorted(
+        tensors.items(),
+        key=lambda kv: (-_SAFETENSORS_DTYPE_RANK[kv[1].dtype], kv[0]),
+    )
+
+    header: dict = {}
+    offset = 0
+    for name, tensor in items:
+        nbytes = tensor.numel() * tensor.element_size()
+        header[name] = {
+            "dtype": _SAFETENSORS_DTYPES[tensor.dtype],
+            "shape": list(tensor.shape),
+            "data_offsets": [offset, offset + nbytes],
+        }
+        offset += nbytes
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    # The data section starts 8-byte aligned; the header is space-padded.
+    header_bytes += b" " * (-len(header_bytes) % 8)
+
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for _, tensor in items:
+            if tensor.numel():
+                data = tensor.detach().cpu().contiguous().reshape(-1).view(torch.uint8)
+                f.write(data.numpy())
+
+
 def _selective_compress_model(
     dfloat11_module,
     *,
     model: nn.Module,
-    pattern_dict: Dict[str, Tuple[str, ...]],
+    target_names: set[str],
     save_path: str,
     compression_threshold: float = 100.0,
+    encode_workers: int = 1,
+    verify_fraction: float = 0.0,
+    verify_rng: random.Random | None = None,
+    verbose: bool = False,
 ) -> None:
     """
     A selective variant of dfloat11.compress_model:
 
     - 仅支持我们当前用到的场景：
-      - pattern_dict 的 key 是完整 module 名（精确匹配），value 为空元组；
+      - target_names 是完整 module 名的集合（精确匹配）；
       - 只压缩 nn.Linear / nn.Embedding；
       - 只支持 save_single_file=True（写入一个 model.safetensors）。
     - 对每个模块计算实际压缩比：
         compressed_size / original_size * 100
       若压缩比 > compression_threshold（默认 100%）则跳过该模块，
       保留原始 BF16 权重。
+      按指数熵估计的压缩比下界已超过阈值的模块会在构建 codec 之前直接跳过；
+      由 codec 码长表算出的压缩后大小已超过阈值的模块不再执行编码。
     - 仅将实际参与 DF11 压缩的模块写入 dfloat11_config.pattern_dict。
+    - 编码使用向量化的 _encode_weights_fast（与 encode_weights 逐位一致）；
+      有 CUDA 时在 GPU 上编码，否则 encode_workers > 1 时在独立进程中并行
+      执行：权重经共享内存传递，codec 仍在主进程中构建（可复用缓存）。
+    - verify_fraction > 0 时，按该比例随机抽取被压缩的模块，在 GPU 上解码
+      并与原始权重逐位比较（每次只占用单个模块的显存）。
+    - 仅在 verbose=True 时打印每个新建 codec 的码表。
     """
     import dfloat11.dfloat11 as df11_internal  # type: ignore[import]
-    from safetensors.torch import save_file
     import numpy as np
-    import re
 
     os.makedirs(save_path, exist_ok=True)
 
     bytes_per_thread = df11_internal.bytes_per_thread
     threads_per_block = df11_internal.threads_per_block
     version = df11_internal.version
-    get_codec = df11_internal.get_codec
     get_32bit_codec = df11_internal.get_32bit_codec
     get_luts = df11_internal.get_luts
-    encode_weights = df11_internal.encode_weights
 
     block_index = 0
-    save_model = True
-    compressed_patterns: set[str] = set()
-
-    for pattern, attr_names in pattern_dict.items():
-        # 目前我们只使用空 attr_names，且 pattern 是精确 module 名。
-        if attr_names:
-            raise RuntimeError(
-                "Selective DF11 compression currently only supports empty attr_names."
+    compressed_names: set[str] = set()
+    codec_cache: dict[bytes, list] = {}
+    if verify_rng is None:
+        verify_rng = random.Random()
+
+    def _register_encoded(full_name, sub_module, luts, total_elems, outputs, verify) -> None:
+        encoded, other_8bits, output_positions, gaps, split_positions = outputs
+
+        # 与 dfloat11_utils.encode_weights 中相同的压缩率计算方式。
+        compressed_bytes = (
+            encoded.numel()
+            + other_8bits.numel()
+            + output_positions.numel() * 4
+            + gaps.numel()
+        )
+        original_bytes = total_elems * 2  # BF16: 2 bytes per element
+        factor = compressed_bytes * 100.0 / original_bytes
+
+        if factor > compression_threshold:
+            print(
+                f"[DF11] Skipping module {full_name}: "
+                f"compression factor {factor:.2f}% > {compression_threshold}%."
             )
+            # 保持原始权重，不删除 weight，也不注册 DF11 buffer。
+            return
 
-        for full_name, sub_module in model.named_modules():
-            if not re.fullmatch(pattern, full_name):
-                continue
+        print(
+            f"[DF11] Compressing module {full_name}: "
+            f"compression factor {factor:.2f}% <= {compression_threshold}%."
+        )
 
-            # 只处理 Linear / Embedding，其他类型模块跳过。
-            if not isinstance(sub_module, (nn.Linear, nn.Embedding)):
+        if verify:
+            _verify_df11_module(
+                df11_internal,
+                full_name,
+                sub_module.weight.data,
+                luts,
+                encoded,
+                other_8bits,
+                output_positions,
+                gaps,
+                bytes_per_thread=bytes_per_thread,
+                threads_per_block=threads_per_block[0],
+            )
+
+        # 删除原始权重，注册 DF11 buffer，行为与官方 compress_model 一致。
+        # The six buffers are deliberately kept as separate tensors rather
+        # than views into one per-module arena: shared storage would be written
+        # once per view (safetensors' save_file rejects it outright), and
+        # DFloat11's loader looks them up by these exact names, so an extra
+        # arena key would break loading.
+        _fast_replace_weight_with_df11_buffers(
+            sub_module,
+            {
+                "luts": luts,
+                "encoded_exponent": encoded,
+                "sign_mantissa": other_8bits,
+                "output_positions": output_positions.view(torch.uint8),
+                "gaps": gaps,
+                "split_positions": split_positions,
+            },
+        )
+
+        compressed_names.add(full_name)
+
+    # A GPU encodes a module far faster than the CPU fan-out, and each pool
+    # worker would need its own CUDA context, so the pool is CPU-only.
+    encode_device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    if encode_device.type == "cuda":
+        print("[DF11] Encoding on CUDA.")
+
+    # Parallel encoding: each in-flight module owns one shared-memory block
+    # holding a copy of its weight. In-flight work is bounded so at most a
+    # few weights are duplicated at any time.
+    pool: ProcessPoolExecutor | None = None
+    if encode_workers > 1 and encode_device.type == "cpu":
+        pool = ProcessPoolExecutor(
+            max_workers=encode_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    max_in_flight = 2 * encode_workers
+    pending: dict = {}
+
+    def _collect(return_when) -> None:
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            shm, full_name, sub_module, luts, total_elems, verify = pending.pop(future)
+            shm.close()
+            shm.unlink()
+            outputs = tuple(torch.from_numpy(a) for a in future.result())
+            _register_encoded(full_name, sub_module, luts, total_elems, outputs, verify)
+            del outputs, luts
+
+    try:
+        # Walk the cached Linear / Embedding targets once, in module order,
+        # and pick out the requested names.
+        for full_name, sub_module in _enumerate_df11_targets(model):
+            if full_name not in target_names:
                 continue
 
             block_index += 1
@@ -404,111 +1059,171 @@ def _selective_compress_model(
                 # 目前不支持 block_range 子集，若需要可以扩展。
                 continue
 
-            weights: list[torch.Tensor] = []
-            assert sub_module.weight.data.dtype == torch.bfloat16, (
+            weight = sub_module.weight.data
+            assert weight.dtype == torch.bfloat16, (
                 f"Expected weights to be in bfloat16 format for compression, "
-                f"but '{full_name}' has dtype {sub_module.weight.data.dtype}"
-            )
-            weights.append(sub_module.weight.data.detach().cpu().flatten())
-
-            total_elems = sum(w.numel() for w in weights)
-
-            _codec, _counter = get_codec(torch.cat(weights))
-            codec, _, table = get_32bit_codec(_counter)
-            codec.print_code_table()
-
-            luts = get_luts(table)
-
-            encoded, other_8bits, output_positions, gaps, split_positions = encode_weights(
-                weights, codec, bytes_per_thread, threads_per_block[0]
-            )
-
-            # 与 dfloat11_utils.encode_weights 中相同的压缩率计算方式。
-            compressed_bytes = (
-                encoded.numel()
-                + other_8bits.numel()
-                + output_positions.numel() * 4
-                + gaps.numel()
+                f"but '{full_name}' has dtype {weight.dtype}"
             )
-            original_bytes = total_elems * 2  # BF16: 2 bytes per element
-            factor = compressed_bytes * 100.0 / original_bytes
-
-            if factor > compression_threshold:
+            if weight.device.type != "cpu":
+                weight = weight.cpu()
+            # Weights loaded on CPU are contiguous: encode a flat view of
+            # the parameter itself rather than a copy.
+            if weight.is_contiguous():
+                weight = weight.view(-1)
+            else:
+                print(f"[DF11] Warning: weight of {full_name} is not contiguous; copying it.")
+                weight = weight.reshape(-1)
+
+            total_elems = weight.numel()
+
+            # codec / table / LUTs depend only on the exponent histogram, so
+            # modules with an identical histogram (e.g. tied or identically
+            # initialized weights) reuse them instead of rebuilding.
+            histogram = _exponent_histogram(weight)
+
+            # Skip modules that cannot reach the threshold before paying for
+            # a codec and an encode pass whose result would be discarded.
+            min_factor = _min_compression_factor(histogram)
+            if min_factor > compression_threshold:
                 print(
                     f"[DF11] Skipping module {full_name}: "
-                    f"compression factor {factor:.2f}% > {compression_threshold}%."
+                    f"compression factor >= {min_factor:.2f}% > {compression_threshold}% "
+                    "(exponent entropy bound)."
                 )
-                # 保持原始权重，不删除 weight，也不注册 DF11 buffer。
+                del weight, histogram
                 continue
 
-            print(
-                f"[DF11] Compressing module {full_name}: "
-                f"compression factor {factor:.2f}% <= {compression_threshold}%."
-            )
-
-            # 删除原始权重，注册 DF11 buffer，行为与官方 compress_model 一致。
-            delattr(sub_module, "weight")
-
-            sub_module.register_buffer("luts", luts)
-            sub_module.register_buffer("encoded_exponent", encoded)
-            sub_module.register_buffer("sign_mantissa", other_8bits)
-            sub_module.register_buffer(
-                "output_positions", output_positions.view(torch.uint8)
+            hist_key = histogram.numpy().tobytes()
+            cached = codec_cache.get(hist_key)
+            if cached is None:
+                codec, _, table = get_32bit_codec(_fast_bf16_counter(histogram))
+                if verbose:
+                    codec.print_code_table()
+                cached = codec_cache[hist_key] = [codec, table, None]
+            codec, table, luts = cached
+
+            # With the code table built, the encoded size is known up to a few
+            # bytes: skip modules that provably miss the threshold before
+            # building LUTs and running the encode pass.
+            min_factor = (
+                _df11_min_compressed_bytes(
+                    histogram, table, bytes_per_thread, threads_per_block[0]
+                )
+                * 100.0
+                / (total_elems * 2)
             )
-            sub_module.register_buffer("gaps", gaps)
-            sub_module.register_buffer("split_positions", split_positions)
-
-            compressed_patterns.add(pattern)
-
-        if not save_model:
-            break
-
-    if save_model:
-        # 仅将实际参与压缩的 pattern 写入 config。
-        compressed_pattern_dict: Dict[str, Tuple[str, ...]] = {
-            k: v for k, v in pattern_dict.items() if k in compressed_patterns
-        }
-
-        dfloat11_config = {
-            "version": version,
-            "threads_per_block": threads_per_block,
-            "bytes_per_thread": bytes_per_thread,
-            "pattern_dict": compressed_pattern_dict,
-        }
-        if hasattr(model, "config"):
-            try:
-                model.config.dfloat11_config = dfloat11_config
-            except Exception:
-                pass
-
-        # 单文件 safetensors 输出。
-        save_file(model.state_dict(), os.path.join(save_path, "model.safetensors"))
+            if min_factor > compression_threshold:
+                print(
+                    f"[DF11] Skipping module {full_name}: "
+                    f"compression factor >= {min_factor:.2f}% > {compression_threshold}% "
+                    "(code table bound)."
+                )
+                del weight, histogram
+                continue
 
-        # 写入 / 合并 config.json（若已有其他字段，保留原内容）。
-        cfg_path = os.path.join(save_path, "config.json")
-        save_config = True
-        config: dict = {}
-        if os.path.exists(cfg_path):
-            try:
-                import json as _json
+            if luts is None:
+                luts = cached[2] = get_luts(table)
+            else:
+                # Keep one LUT tensor per module: shared storage would be
+                # written once per module (save_file would reject it).
+                luts = luts.clone()
 
-                with open(cfg_path, "r", encoding="utf-8") as f:
-                    config = _json.load(f)
-                if "dfloat11_config" in config and isinstance(
-                    config["dfloat11_config"], dict
-                ):
-                    save_config = False
-            except Exception:
-                # 如果现有 config.json 读失败，就覆盖它。
-                config = {}
-                save_config = True
+            # Drawn in module order so a seeded rng picks the same sample
+            # regardless of the order parallel results arrive in.
+            verify = verify_fraction > 0 and verify_rng.random() < verify_fraction
 
-        if save_config:
-            import json as _json
+            if pool is None:
+                outputs = _encode_weights_fast(
+                    [weight], codec, bytes_per_thread, threads_per_block[0], encode_device
+                )
+                _register_encoded(
+                    full_name, sub_module, luts, total_elems, outputs, verify
+                )
+                del outputs
+            else:
+                shm = shared_memory.SharedMemory(create=True, size=total_elems * 2)
+                try:
+                    dst = np.ndarray((total_elems,), dtype=np.int16, buffer=shm.buf)
+                    dst[:] = weight.view(torch.int16).numpy()
+                    del dst
+                    future = pool.submit(
+                        _encode_shared_weight,
+                        shm.name,
+                        total_elems,
+                        codec,
+                        bytes_per_thread,
+                        threads_per_block[0],
+                    )
+                except BaseException:
+                    shm.close()
+                    shm.unlink()
+                    raise
+                pending[future] = (shm, full_name, sub_module, luts, total_elems, verify)
+
+                if len(pending) >= max_in_flight:
+                    _collect(FIRST_COMPLETED)
+
+            # Release this module's tensors now instead of when the next
+            # iteration rebinds them, so the original weight (or, for a
+            # skipped module, its encoded copy) never overlaps with the
+            # next module's.
+            del weight, histogram, luts
+
+            # Return any cyclic garbage (e.g. from codec construction) to
+            # the allocator periodically rather than at the GC's whim.
+            if block_index % 8 == 0:
+                gc.collect()
+
+        while pending:
+            _collect(ALL_COMPLETED)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        for shm, *_ in pending.values():
+            shm.close()
+            shm.unlink()
+
+    # 仅将实际参与压缩的模块写入 config 的 pattern_dict。
+    compressed_pattern_dict = _as_pattern_dict(model, compressed_names)
+
+    dfloat11_config = {
+        "version": version,
+        "threads_per_block": threads_per_block,
+        "bytes_per_thread": bytes_per_thread,
+        "pattern_dict": compressed_pattern_dict,
+    }
+    if hasattr(model, "config"):
+        try:
+            model.config.dfloat11_config = dfloat11_config
+        except Exception:
+            pass
+
+    # 单文件 safetensors 输出。
+    _save_safetensors_streaming(
+        model.state_dict(), os.path.join(save_path, "model.safetensors")
+    )
 
-            config["dfloat11_config"] = dfloat11_config
-            with open(cfg_path, "w", encoding="utf-8") as f:
-                _json.dump(config, f, indent=2)
+    # 写入 / 合并 config.json（若已有其他字段，保留原内容）。
+    cfg_path = os.path.join(save_path, "config.json")
+    save_config = True
+    config: dict = {}
+    if os.path.exists(cfg_path):
+        try:
+            with open(cfg_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            if "dfloat11_config" in config and isinstance(
+                config["dfloat11_config"], dict
+            ):
+                save_config = False
+        except Exception:
+            # 如果现有 config.json 读失败，就覆盖它。
+            config = {}
+            save_config = True
+
+    if save_config:
+        config["dfloat11_config"] = dfloat11_config
+        with open(cfg_path, "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=2)
 
 
 def _compress_t5_encoder(
@@ -517,6 +1232,11 @@ def _compress_t5_encoder(
     ckpt_dir: Path,
     save_dir: Path,
     check_correctness: bool,
+    encode_workers: int = 1,
+    verify_fraction: float = 0.0,
+    compression_threshold: float = 100.0,
+    verbose: bool = False,
+    seed: int | None = None,
 ) -> None:
     """
     DF11-compress the T5 text encoder checkpoint used by Wan I2V 14B.
@@ -563,28 +1283,25 @@ def _compress_t5_encoder(
     t5_save_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"[DF11][T5] Loading encoder weights from {t5_ckpt} ...")
-    # Initialize encoder-only UMT5 in bfloat16 on CPU.
-    model = umt5_xxl(
-        encoder_only=True,
-        return_tokenizer=False,
-        dtype=torch.bfloat16,
-        device="cpu",
+    # Initialize encoder-only UMT5 in bfloat16 (on meta when possible).
+    model = _load_checkpoint_into(
+        lambda device: umt5_xxl(
+            encoder_only=True,
+            return_tokenizer=False,
+            dtype=torch.bfloat16,
+            device=device,
+        ),
+        t5_ckpt,
     ).eval().requires_grad_(False)
-
-    state_dict = torch.load(t5_ckpt, map_location="cpu")
-    model.load_state_dict(state_dict)
-    # state_dict no longer needed once loaded into the model.
-    del state_dict
-    gc.collect()
     model.to(torch.bfloat16)
 
-    pattern_dict = _build_pattern_dict(model)
+    target_names = _build_target_names(model)
 
     print(f"[DF11][T5] Compressing into {t5_save_dir} (selective) ...")
     if check_correctness:
         dfloat11_module.compress_model(
             model=model,
-            pattern_dict=pattern_dict,
+            pattern_dict=_as_pattern_dict(model, target_names),
             save_path=str(t5_save_dir),
             block_range=[0, 10_000_000],
             save_single_file=True,
@@ -594,9 +1311,13 @@ def _compress_t5_encoder(
         _selective_compress_model(
             dfloat11_module,
             model=model,
-            pattern_dict=pattern_dict,
+            target_names=target_names,
             save_path=str(t5_save_dir),
-            compression_threshold=100.0,
+            compression_threshold=compression_threshold,
+            encode_workers=encode_workers,
+            verify_fraction=verify_fraction,
+            verify_rng=random.Random(seed),
+            verbose=verbose,
         )
 
     # Release T5 model to free CPU RAM before moving on.
@@ -610,6 +1331,11 @@ def _compress_clip_model(
     ckpt_dir: Path,
     save_dir: Path,
     check_correctness: bool,
+    encode_workers: int = 1,
+    verify_fraction: float = 0.0,
+    compression_threshold: float = 100.0,
+    verbose: bool = False,
+    seed: int | None = None,
 ) -> None:
     """
     DF11-compress the CLIP checkpoint used by Wan I2V 14B.
@@ -663,30 +1389,28 @@ def _compress_clip_model(
     clip_save_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"[DF11][CLIP] Loading CLIP model and weights from {clip_ckpt} ...")
-    # Initialize CLIP in bfloat16 on CPU; weights will be converted from FP16.
-    model = clip_xlm_roberta_vit_h_14(
-        pretrained=False,
-        return_transforms=False,
-        return_tokenizer=False,
-        dtype=torch.bfloat16,
-        device="cpu",
+    # Initialize CLIP in bfloat16 (on meta when possible). With assign=True
+    # the FP16 checkpoint tensors are adopted as-is; .to() converts them.
+    model = _load_checkpoint_into(
+        lambda device: clip_xlm_roberta_vit_h_14(
+            pretrained=False,
+            return_transforms=False,
+            return_tokenizer=False,
+            dtype=torch.bfloat16,
+            device=device,
+        ),
+        clip_ckpt,
     )
     model = model.eval().requires_grad_(False)
-
-    state_dict = torch.load(clip_ckpt, map_location="cpu")
-    model.load_state_dict(state_dict)
-    # state_dict no longer needed once loaded into the model.
-    del state_dict
-    gc.collect()
     model.to(torch.bfloat16)
 
-    pattern_dict = _build_pattern_dict(model)
+    target_names = _build_target_names(model)
 
     print(f"[DF11][CLIP] Compressing into {clip_save_dir} (selective) ...")
     if check_correctness:
         dfloat11_module.compress_model(
             model=model,
-            pattern_dict=pattern_dict,
+            pattern_dict=_as_pattern_dict(model, target_names),
             save_path=str(clip_save_dir),
             block_range=[0, 10_000_000],
             save_single_file=True,
@@ -696,9 +1420,13 @@ def _compress_clip_model(
         _selective_compress_model(
             dfloat11_module,
             model=model,
-            pattern_dict=pattern_dict,
+            target_names=target_names,
             save_path=str(clip_save_dir),
-            compression_threshold=100.0,
+            compression_threshold=compression_threshold,
+            encode_workers=encode_workers,
+            verify_fraction=verify_fraction,
+            verify_rng=random.Random(seed),
+            verbose=verbose,
         )
 
     # Release CLIP model to free CPU RAM before exiting this phase.
@@ -706,6 +1434,192 @@ def _compress_clip_model(
     gc.collect()
 
 
+def _compress_wan(
+    *,
+    dfloat11_module,
+    ckpt_dir: Path,
+    save_dir: Path,
+    check_correctness: bool,
+    encode_workers: int = 1,
+    verify_fraction: float = 0.0,
+    compression_threshold: float = 100.0,
+    verbose: bool = False,
+    seed: int | None = None,
+) -> None:
+    """
+    DF11-compress the Wan diffusion backbone into save_dir.
+    """
+    model = _load_wan_model(ckpt_dir)
+    target_names = _build_target_names(model)
+
+    print("[DF11] Starting compression (Wan diffusion backbone, selective) ...")
+    if not check_correctness:
+        _selective_compress_model(
+            dfloat11_module,
+            model=model,
+            target_names=target_names,
+            save_path=str(save_dir),
+            compression_threshold=compression_threshold,
+            encode_workers=encode_workers,
+            verify_fraction=verify_fraction,
+            verify_rng=random.Random(seed),
+            verbose=verbose,
+        )
+    else:
+        # 若需要开启 correctness check，则退回官方 compress_model 实现。
+        dfloat11_module.compress_model(
+            model=model,
+            pattern_dict=_as_pattern_dict(model, target_names),
+            save_path=str(save_dir),
+            block_range=[0, 10_000_000],
+            save_single_file=True,
+            check_correctness=True,
+        )
+    # Release Wan diffusion model once this phase is done.
+    del model
+    gc.collect()
+
+
+_COMPRESSION_PHASES: Dict[str, Callable[..., None]] = {
+    "diffusion": _compress_wan,
+    "t5": _compress_t5_encoder,
+    "clip": _compress_clip_model,
+}
+
+
+def _numa_node_cpus() -> list[set[int]]:
+    """
+    CPUs of each NUMA node (in node order) that this process may run on.
+
+    Read from /sys/devices/system/node; returns an empty list when the
+    topology is unavailable (non-Linux, containers without sysfs).
+    """
+    try:
+        allowed = os.sched_getaffinity(0)
+        node_dirs = sorted(
+            Path("/sys/devices/system/node").glob("node[0-9]*"),
+            key=lambda p: int(p.name[4:]),
+        )
+    except (AttributeError, OSError):
+        return []
+
+    nodes: list[set[int]] = []
+    for node_dir in node_dirs:
+        try:
+            cpulist = (node_dir / "cpulist").read_text().strip()
+        except OSError:
+            continue
+        cpus: set[int] = set()
+        for part in filter(None, cpulist.split(",")):
+            lo, _, hi = part.partition("-")
+            cpus.update(range(int(lo), int(hi or lo) + 1))
+        cpus &= allowed
+        if cpus:
+            nodes.append(cpus)
+    return nodes
+
+
+def _pin_to_numa_node(index: int) -> None:
+    """
+    Restrict this process (and the encode workers it spawns) to the CPUs of
+    one NUMA node, `index` modulo the node count. No-op on single-node hosts.
+
+    Linux allocates pages on the node of the CPU that first touches them, so
+    pinning the CPUs also keeps the model weights and encode buffers in
+    local memory instead of spread across sockets.
+    """
+    nodes = _numa_node_cpus()
+    if len(nodes) < 2:
+        return
+    cpus = nodes[index % len(nodes)]
+    os.sched_setaffinity(0, cpus)
+    torch.set_num_threads(len(cpus))
+    print(f"[DF11] Pinned to NUMA node {index % len(nodes)} ({len(cpus)} CPUs).")
+
+
+def _run_phase_in_subprocess(
+    phase: str,
+    phase_kwargs: dict,
+    threads_per_block: int,
+    numa_node: int | None = None,
+) -> None:
+    """
+    Process entry point for _run_phases_in_processes: set up DFloat11 in
+    this interpreter and run a single compression phase.
+    """
+    if numa_node is not None:
+        _pin_to_numa_node(numa_node)
+    dfloat11_module = _import_dfloat11(_get_repo_root())
+    _patch_dfloat11_get_luts(dfloat11_module)
+    _override_threads_per_block(dfloat11_module, threads_per_block)
+    _COMPRESSION_PHASES[phase](dfloat11_module=dfloat11_module, **phase_kwargs)
+
+
+def _run_phases_in_processes(
+    phases: list[str],
+    phase_kwargs: dict,
+    threads_per_block: int,
+    max_parallel: int,
+    numa_pin: bool = True,
+) -> None:
+    """
+    Run compression phases in spawned processes, at most `max_parallel` at
+    a time.
+
+    The phases share no tensors, so each gets its own interpreter and heap,
+    and a failing phase does not take the others down. With `numa_pin`,
+    concurrent phases are pinned to different NUMA nodes. Raises SystemExit
+    once all phases have finished if any of them failed.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queued = list(phases)
+    running: dict = {}
+    failed: list[str] = []
+
+    while queued or running:
+        while queued and len(running) < max_parallel:
+            phase = queued.pop(0)
+            numa_node = None
+            if numa_pin:
+                busy = {node for _, _, node in running.values()}
+                numa_node = next(i for i in range(max_parallel) if i not in busy)
+            proc = ctx.Process(
+                target=_run_phase_in_subprocess,
+                args=(phase, phase_kwargs, threads_per_block, numa_node),
+                name=f"df11-{phase}",
+            )
+            proc.start()
+            running[proc.sentinel] = (phase, proc, numa_node)
+
+        for sentinel in multiprocessing.connection.wait(list(running)):
+            phase, proc, _ = running.pop(sentinel)
+            proc.join()
+            if proc.exitcode != 0:
+                print(
+                    f"[DF11] Compression phase '{phase}' failed (exit code {proc.exitcode}).",
+                    file=sys.stderr,
+                )
+                failed.append(phase)
+
+    if failed:
+        raise SystemExit(f"DF11 compression failed for: {', '.join(failed)}")
+
+
+def _default_max_parallel() -> int:
+    """
+    Default for --max-parallel. With CUDA available every phase uses the GPU
+    (the correctness check, or the CUDA encoder), and two phases sharing it
+    risk the OOM described above, so run one at a time. CPU-only, each phase
+    holds a whole model in RAM: run two at once on hosts with more than 96 GB.
+    """
+    if torch.cuda.is_available():
+        return 1
+    try:
+        total_ram = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return 1
+    return 2 if total_ram > 96 * 1024**3 else 1
+
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -755,6 +1669,69 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
             "This saves VRAM and time but skips validation."
         ),
     )
+    parser.add_argument(
+        "--compression-threshold",
+        type=float,
+        default=100.0,
+        help=(
+            "Keep a module in BF16 when its DF11 size would exceed this "
+            "percentage of the original (selective path only)."
+        ),
+    )
+    parser.add_argument(
+        "--sample-check-frac",
+        type=float,
+        default=0.0,
+        help=(
+            "Instead of checking every module, decode-verify this random "
+            "fraction of compressed modules on the GPU (e.g. 0.05). "
+            "0 keeps the full check; ignored with --no-check-correctness."
+        ),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help=(
+            "Seed for choosing the --sample-check-frac modules, so the same "
+            "modules are verified on every run (default: random)."
+        ),
+    )
+    parser.add_argument(
+        "--encode-workers",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help=(
+            "Number of processes used to DF11-encode modules in parallel on "
+            "CPU (selective path only; unused when CUDA is available). "
+            "Defaults to half the CPU count; use 1 to encode in-process."
+        ),
+    )
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=_default_max_parallel(),
+        help=(
+            "Run up to this many of the diffusion / T5 / CLIP compressions "
+            "concurrently, each in its own process. Defaults to 1 when CUDA is "
+            "available (phases would share one GPU); otherwise 2 on hosts with "
+            "more than 96 GB of RAM, else 1."
+        ),
+    )
+    parser.add_argument(
+        "--no-numa-pin",
+        action="store_true",
+        help=(
+            "Do not pin compression to a single NUMA node. By default, on "
+            "multi-socket hosts each phase runs on (and allocates from) one "
+            "node; concurrent phases use different nodes."
+        ),
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print the Huffman code table of every codec built (selective path only).",
+    )
     parser.add_argument(
         "--skip-t5",
         action="store_true",
@@ -799,57 +1776,52 @@ def main(argv: list[str] | None = None) -> None:
     print("[DF11] Copying non-weight assets into DF11 directory ...")
     _copy_auxiliary_files(ckpt_dir, save_dir)
 
-    dfloat11_module = _import_dfloat11(repo_root)
-    _patch_dfloat11_get_luts(dfloat11_module)
-    _override_threads_per_block(dfloat11_module, args.threads_per_block)
+    # --sample-check-frac swaps the full per-module check for a sampled one
+    # on the selective path; --no-check-correctness disables both.
+    verify_fraction = 0.0 if args.no_check_correctness else args.sample_check_frac
+    full_check = not args.no_check_correctness and verify_fraction <= 0
 
+    phases: list[str] = []
     if not args.skip_diffusion:
-        model = _load_wan_model(ckpt_dir)
-        pattern_dict = _build_pattern_dict(model)
-
-        print("[DF11] Starting compression (Wan diffusion backbone, selective) ...")
-        if args.no_check_correctness:
-            _selective_compress_model(
-                dfloat11_module,
-                model=model,
-                pattern_dict=pattern_dict,
-                save_path=str(save_dir),
-                compression_threshold=100.0,
-            )
-        else:
-            # 若需要开启 correctness check，则退回官方 compress_model 实现。
-            dfloat11_module.compress_model(
-                model=model,
-                pattern_dict=pattern_dict,
-                save_path=str(save_dir),
-                block_range=[0, 10_000_000],
-                save_single_file=True,
-                check_correctness=True,
-            )
-        # Release Wan diffusion model once this phase is done.
-        del model
-        gc.collect()
+        phases.append("diffusion")
     else:
         print("[DF11] Skipping Wan diffusion backbone compression (per --skip-diffusion).")
-
-    # Optionally compress the T5 text encoder checkpoint into a separate
-    # DF11 directory under save_dir.
+    # T5 / CLIP are compressed into separate DF11 directories under save_dir.
     if not args.skip_t5:
-        _compress_t5_encoder(
-            dfloat11_module=dfloat11_module,
-            ckpt_dir=ckpt_dir,
-            save_dir=save_dir,
-            check_correctness=not args.no_check_correctness,
-        )
-
-    # Optionally compress the CLIP checkpoint into a separate DF11 directory.
+        phases.append("t5")
     if not args.skip_clip:
-        _compress_clip_model(
-            dfloat11_module=dfloat11_module,
-            ckpt_dir=ckpt_dir,
-            save_dir=save_dir,
-            check_correctness=not args.no_check_correctness,
+        phases.append("clip")
+
+    phase_kwargs = {
+        "ckpt_dir": ckpt_dir,
+        "save_dir": save_dir,
+        "check_correctness": full_check,
+        "encode_workers": args.encode_workers,
+        "verify_fraction": verify_fraction,
+        "compression_threshold": args.compression_threshold,
+        "verbose": args.verbose,
+        "seed": args.seed,
+    }
+
+    max_parallel = min(args.max_parallel, len(phases))
+    if max_parallel > 1:
+        # Concurrent phases split the encode processes between them.
+        phase_kwargs["encode_workers"] = max(1, args.encode_workers // max_parallel)
+        _run_phases_in_processes(
+            phases,
+            phase_kwargs,
+            args.threads_per_block,
+            max_parallel,
+            numa_pin=not args.no_numa_pin,
         )
+    else:
+        if not args.no_numa_pin:
+            _pin_to_numa_node(0)
+        dfloat11_module = _import_dfloat11(repo_root)
+        _patch_dfloat11_get_luts(dfloat11_module)
+        _override_threads_per_block(dfloat11_module, args.threads_per_block)
+        for phase in phases:
+            _COMPRESSION_PHASES[phase](dfloat11_module=dfloat11_module, **phase_kwargs)
 
     print("\n[DF11] Compression completed.")
     print(f"DFloat11 model saved under: {save_dir}")
@@ -7,6 +7,8 @@ Supports two sources:
 - ModelScope  (default): https://modelscope.cn/models/MCG-NJU/MCG-NJU-SteadyDancer-14B
 - HuggingFace: https://huggingface.co/MCG-NJU/SteadyDancer-14B
 
+`--source both` races the two mirrors and keeps whichever finishes first.
+
 Usage examples (from repo root):
 
   # Use MODELS_DIR or ./models as root, download from ModelScope
@@ -18,20 +20,86 @@ Usage examples (from repo root):
   # Override models root
   uv run --project apps/api python scripts/download_models.py --models-dir /models
 
-The script is idempotent: repeated runs reuse underlying caches.
+HuggingFace downloads use the multi-connection `hf_transfer` backend when it
+is installed (`pip install hf_transfer`); pass --no-hf-transfer to fall back
+to huggingface_hub's default downloader.
+
+The script is idempotent: repeated runs reuse underlying caches. A completed
+download leaves a `.steadydancer_snapshot.json` marker in the target
+directory; later runs skip the network while it is fresh
+(--snapshot-ttl-hours) and --force downloads again regardless.
 It does NOT commit any downloaded files to Git (models/ is .gitignored).
 """
 
 import argparse
+import hashlib
+import inspect
+import json
+import logging
+import multiprocessing
+import multiprocessing.connection
 import os
+import shutil
+import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import Literal
+from typing import Callable, Literal, TypeVar
 
 
 MODELSCOPE_MODEL_ID = "MCG-NJU/MCG-NJU-SteadyDancer-14B"
 HUGGINGFACE_MODEL_ID = "MCG-NJU/SteadyDancer-14B"
 DEFAULT_MODEL_SUBDIR = "SteadyDancer-14B"
+# Files fetched concurrently; the checkpoint is split into many shards.
+DEFAULT_DOWNLOAD_WORKERS = 16
+# Connections aria2c opens per file (--backend aria2).
+ARIA2_CONNECTIONS_PER_FILE = 16
+# Attempts per download; the wait between them doubles, starting at 1s.
+DOWNLOAD_ATTEMPTS = 5
+
+# Framework formats this repo never loads (it only uses PyTorch weights).
+DEFAULT_IGNORE_PATTERNS = ["*.onnx", "*.msgpack", "*.h5", "*.ot"]
+
+# Lock file (under the models root) serializing cache eviction passes.
+EVICTION_LOCK = ".download-eviction.lock"
+
+# Per-mirror scratch directories (under the target dir) for --source both.
+RACE_STAGING_PREFIX = ".download-"
+
+# Written into the target directory once a download has completed.
+SNAPSHOT_MARKER = ".steadydancer_snapshot.json"
+# A marker younger than this is trusted without contacting the hub.
+DEFAULT_SNAPSHOT_TTL_HOURS = 24.0
+
+T = TypeVar("T")
+
+log = logging.getLogger("download_models")
+
+
+def _configure_logging(quiet: bool = False, json_output: bool = False) -> None:
+    """
+    Route the script's messages through logging.
+
+    --quiet keeps warnings and errors only; --json moves all logs to stderr
+    so stdout carries just the final JSON summary. Both also silence the
+    hubs' per-file progress bars.
+    """
+    logging.basicConfig(
+        level=logging.WARNING if quiet else logging.INFO,
+        format="%(message)s",
+        stream=sys.stderr if json_output or quiet else sys.stdout,
+        force=True,
+    )
+    if quiet or json_output:
+        # Read by huggingface_hub at import time; inherited by child processes.
+        os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "1"
+
+
+# scripts/download_models.py -> scripts -> repo_root
+_REPO_ROOT = Path(__file__).resolve().parents[1]
 
 
 def resolve_models_root(explicit: str | None) -> Path:
@@ -39,25 +107,158 @@ def resolve_models_root(explicit: str | None) -> Path:
     Resolve the MODELS_DIR root, following the repo-wide convention:
 
     - If --models-dir is provided, use it.
-    - Else if MODELS_DIR env var is set, use it.
-    - Else default to <repo_root>/models.
+    - Otherwise defer to libs.py_core.config.get_models_dir() (MODELS_DIR,
+      else its default), so downloads land where the API / worker look.
+    - If libs is not importable, fall back to MODELS_DIR or
+      <repo_root>/models.
     """
     if explicit:
-        root = Path(explicit)
-    else:
+        return Path(explicit).expanduser().resolve()
+
+    if str(_REPO_ROOT) not in sys.path:
+        sys.path.append(str(_REPO_ROOT))
+    try:
+        from libs.py_core.config import get_models_dir
+    except ImportError:
         env_value = os.getenv("MODELS_DIR")
-        if env_value:
-            root = Path(env_value)
-        else:
-            repo_root = Path(__file__).resolve().parents[1]
-            root = repo_root / "models"
+        root = Path(env_value) if env_value else _REPO_ROOT / "models"
+        return root.expanduser().resolve()
+    return get_models_dir()
+
+
+def _with_retries(label: str, fn: Callable[[], T], attempts: int = DOWNLOAD_ATTEMPTS) -> T:
+    """
+    Call fn(), retrying network failures with exponential backoff.
+
+    Both hubs keep partially downloaded files and resume them with HTTP Range
+    requests, so a retry only transfers the missing bytes. Client errors
+    (4xx other than 429, e.g. an unknown repo) are raised immediately.
+    """
+    for attempt in range(1, attempts):
+        try:
+            return fn()
+        except OSError as exc:  # ConnectionError and requests' exceptions
+            response = getattr(exc, "response", None)
+            status = getattr(response, "status_code", None)
+            if status is not None and 400 <= status < 500 and status != 429:
+                raise
+            delay = 2 ** (attempt - 1)
+            log.warning(
+                f"[{label}] Attempt {attempt}/{attempts} failed: {exc}. "
+                f"Retrying in {delay}s ..."
+            )
+            time.sleep(delay)
+    return fn()
+
+
+def _configure_hf_transfer(enabled: bool) -> None:
+    """
+    Select huggingface_hub's hf_transfer backend (if installed) or opt out.
 
-    return root.expanduser().resolve()
+    huggingface_hub reads HF_HUB_ENABLE_HF_TRANSFER when it is first
+    imported, so this must run before any huggingface_hub import.
+    """
+    if not enabled:
+        os.environ["HF_HUB_ENABLE_HF_TRANSFER"] = "0"
+        return
+    try:
+        import hf_transfer  # type: ignore[import]  # noqa: F401
+    except ImportError:
+        return
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
+
+def _read_snapshot_marker(target_dir: Path) -> dict | None:
+    """
+    Return the completed-download marker of target_dir, or None.
+    """
+    try:
+        with open(target_dir / SNAPSHOT_MARKER, encoding="utf-8") as f:
+            marker = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return marker if isinstance(marker, dict) else None
+
+
+def _write_snapshot_marker(
+    target_dir: Path, request: dict, mirror: str, revision: str | None
+) -> None:
+    """
+    Record that target_dir holds a complete snapshot for `request` (source,
+    requested revision and file patterns), fetched from `mirror` and
+    resolved to commit `revision`.
+    """
+    marker = {**request, "mirror": mirror, "revision": revision, "timestamp": time.time()}
+    tmp_path = target_dir / f"{SNAPSHOT_MARKER}.tmp"
+    tmp_path.write_text(json.dumps(marker, indent=2), encoding="utf-8")
+    os.replace(tmp_path, target_dir / SNAPSHOT_MARKER)
+
+
+def _hf_remote_revision(revision: str | None = None) -> str | None:
+    """
+    Commit SHA that `revision` (default: the main branch) of the HuggingFace
+    repo currently points at (one API call), or None if it cannot be
+    determined.
+    """
+    try:
+        from huggingface_hub import HfApi  # type: ignore[import]
+
+        return HfApi().model_info(HUGGINGFACE_MODEL_ID, revision=revision).sha
+    except Exception:
+        return None
+
+
+def _download_started(target_dir: Path) -> bool:
+    """
+    Whether target_dir holds traces of a download that has begun: HF's
+    local_dir metadata, ModelScope's temp dir, race staging dirs, or partial
+    (*.incomplete / aria2 control) files.
+
+    Such a directory may be missing files even if config.json is present.
+    """
+    if (target_dir / ".cache" / "huggingface").exists() or (target_dir / "._____temp").exists():
+        return True
+    if any(child.name.startswith(RACE_STAGING_PREFIX) for child in target_dir.iterdir()):
+        return True
+    return any(
+        path.suffix in (".incomplete", ".aria2") for path in target_dir.rglob("*") if path.is_file()
+    )
+
+
+def _snapshot_is_current(marker: dict, request: dict, ttl_hours: float) -> bool:
+    """
+    Decide whether a marked snapshot can be reused without downloading.
+
+    The marker must come from the same request (source, revision, file
+    patterns). Within the TTL the marker is trusted as-is. Past it, a HuggingFace
+    snapshot is revalidated by comparing commit SHAs instead of letting
+    snapshot_download issue a request per file. ModelScope downloads are
+    flattened into target_dir and cannot be refreshed in place, so their
+    marker stays valid until --force.
+    """
+    if any(marker.get(key) != value for key, value in request.items()):
+        return False
+    age_hours = (time.time() - float(marker.get("timestamp", 0))) / 3600
+    if age_hours < ttl_hours or marker.get("mirror", request["source"]) == "modelscope":
+        return True
+    revision = marker.get("revision")
+    return revision is not None and _hf_remote_revision(request["requested_revision"]) == revision
 
 
-def download_from_modelscope(target_dir: Path) -> Path:
+def download_from_modelscope(
+    target_dir: Path,
+    workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    revision: str | None = None,
+    allow_patterns: list[str] | None = None,
+    ignore_patterns: list[str] | None = None,
+) -> Path:
     """
-    Download SteadyDancer-14B from ModelScope into target_dir.
+    Download SteadyDancer-14B from ModelScope into target_dir (an existing,
+    resolved directory; see main()).
+
+    `workers` and the file patterns are forwarded on modelscope versions
+    that support them (older releases name the patterns
+    allow_file_pattern / ignore_file_pattern).
 
     Requires:
       pip install "modelscope>=1.9"
@@ -65,71 +266,590 @@ def download_from_modelscope(target_dir: Path) -> Path:
     try:
         from modelscope.hub.snapshot_download import snapshot_download  # type: ignore[import]
     except ImportError as exc:  # pragma: no cover - runtime dependency
-        print(
-            "ERROR: Python package 'modelscope' is not installed.\n"
+        log.error(
+            "Python package 'modelscope' is not installed.\n"
             "Install it first, for example:\n"
-            "  pip install 'modelscope>=1.9'\n",
-            file=sys.stderr,
+            "  pip install 'modelscope>=1.9'\n"
         )
         raise SystemExit(1) from exc
 
-    target_dir = target_dir.expanduser().resolve()
-    target_dir.mkdir(parents=True, exist_ok=True)
-
-    print(f"[ModelScope] Downloading {MODELSCOPE_MODEL_ID} into {target_dir} ...")
+    log.info(f"[ModelScope] Downloading {MODELSCOPE_MODEL_ID} into {target_dir} ...")
 
-    # Prefer placing files directly under target_dir where supported.
     try:
-        local_path_str = snapshot_download(  # type: ignore[call-arg]
-            MODELSCOPE_MODEL_ID,
-            cache_dir=str(target_dir),
-        )
-    except TypeError:
-        # Fallback for older versions: use cache_dir only.
-        local_path_str = snapshot_download(MODELSCOPE_MODEL_ID, cache_dir=str(target_dir))  # type: ignore[call-arg]
+        params = inspect.signature(snapshot_download).parameters
+    except (TypeError, ValueError):
+        params = {}
+
+    extra_kwargs: dict = {}
+    if "max_workers" in params:
+        extra_kwargs["max_workers"] = workers
+    if revision:
+        extra_kwargs["revision"] = revision
+    for names, patterns in (
+        (("allow_patterns", "allow_file_pattern"), allow_patterns),
+        (("ignore_patterns", "ignore_file_pattern"), ignore_patterns),
+    ):
+        if not patterns:
+            continue
+        name = next((n for n in names if n in params), None)
+        if name is None:
+            log.warning(
+                f"[ModelScope] Warning: installed modelscope does not support {names[0]}; "
+                "downloading all files."
+            )
+        else:
+            extra_kwargs[name] = patterns
+
+    def _download() -> str:
+        # Prefer placing files directly under target_dir where supported.
+        try:
+            return snapshot_download(  # type: ignore[call-arg]
+                MODELSCOPE_MODEL_ID,
+                cache_dir=str(target_dir),
+                **extra_kwargs,
+            )
+        except TypeError:
+            # Fallback for older versions: use cache_dir only.
+            return snapshot_download(MODELSCOPE_MODEL_ID, cache_dir=str(target_dir))  # type: ignore[call-arg]
 
-    local_path = Path(local_path_str).expanduser().resolve()
-    print(f"[ModelScope] Model cached at: {local_path}")
-    print(
+    local_path_str = _with_retries("ModelScope", _download)
+
+    # The nested snapshot path is compared against target_dir in main().
+    local_path = Path(local_path_str).resolve()
+    log.info(f"[ModelScope] Model cached at: {local_path}")
+    log.info(
         "You can set STEADYDANCER_CKPT_DIR to this path if it differs from "
         f"{target_dir}."
     )
     return local_path
 
 
-def download_from_huggingface(target_dir: Path) -> Path:
+def _link_snapshot(snapshot_dir: Path, target_dir: Path) -> None:
+    """
+    Populate target_dir with links to the files of a HuggingFace cache
+    snapshot (whose entries are symlinks into the cache's blob store).
+
+    Files are hardlinked to their blobs, so target_dir stays valid even if
+    the cache is pruned; across filesystems a symlink to the blob is used.
+    Existing files in target_dir are left untouched.
+    """
+    for src in snapshot_dir.rglob("*"):
+        if src.is_dir():
+            continue
+        dest = target_dir / src.relative_to(snapshot_dir)
+        if dest.exists():
+            continue
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        blob = src.resolve()
+        try:
+            os.link(blob, dest)
+        except OSError:
+            dest.symlink_to(blob)
+
+
+def _download_order(
+    files: list[tuple[str, int]], priority_patterns: list[str] | None
+) -> list[str]:
+    """
+    Order (path, size) pairs for download: files matching the first priority
+    pattern, then the second, ..., then everything else; smallest first
+    within each group, so configs and tokenizers land before the shards.
+    """
+    patterns = priority_patterns or []
+
+    def _key(item: tuple[str, int]) -> tuple[int, int, str]:
+        path, size = item
+        rank = next((i for i, pattern in enumerate(patterns) if fnmatch(path, pattern)), len(patterns))
+        return rank, size, path
+
+    return [path for path, _ in sorted(files, key=_key)]
+
+
+def _download_files_huggingface(
+    target_dir: Path,
+    workers: int,
+    revision: str | None,
+    allow_patterns: list[str] | None,
+    ignore_patterns: list[str] | None,
+    priority_patterns: list[str] | None,
+) -> None:
+    """
+    Fetch the repo file by file with hf_hub_download on a thread pool.
+
+    Files are pinned to one commit, ordered by _download_order() and retried
+    individually. The first file that still fails is logged at once and
+    cancels the queued ones; since hf_hub_download cannot be interrupted, the
+    error is raised only after the downloads already running have finished
+    (their partial files resume on the next run).
+    """
+    from huggingface_hub import HfApi, hf_hub_download  # type: ignore[import]
+    from huggingface_hub.utils import filter_repo_objects  # type: ignore[import]
+
+    api = HfApi()
+    # Pin the commit so every file comes from the same snapshot even if the
+    # branch moves while downloading.
+    commit = _with_retries(
+        "HuggingFace", lambda: api.model_info(HUGGINGFACE_MODEL_ID, revision=revision).sha
+    )
+    entries = _with_retries(
+        "HuggingFace",
+        lambda: [
+            (entry.path, entry.size or 0)
+            for entry in api.list_repo_tree(HUGGINGFACE_MODEL_ID, revision=commit, recursive=True)
+            if getattr(entry, "size", None) is not None  # files only, not folders
+        ],
+    )
+    entries = list(
+        filter_repo_objects(
+            entries,
+            allow_patterns=allow_patterns,
+            ignore_patterns=ignore_patterns,
+            key=lambda entry: entry[0],
+        )
+    )
+    order = _download_order(entries, priority_patterns)
+
+    def _fetch(filename: str) -> str:
+        return _with_retries(
+            "HuggingFace",
+            lambda: hf_hub_download(
+                HUGGINGFACE_MODEL_ID,
+                filename,
+                revision=commit,
+                local_dir=str(target_dir),
+            ),
+        )
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {pool.submit(_fetch, filename): filename for filename in order}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                future.result()
+            except BaseException as exc:
+                in_flight = sum(1 for f in futures if f.running())
+                log.error(
+                    f"[HuggingFace] {futures[future]} failed: {exc}; cancelling queued files "
+                    f"and waiting for {in_flight} running download(s) to stop."
+                )
+                raise
+            log.info(f"[HuggingFace] ({done}/{len(order)}) {futures[future]}")
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def download_from_huggingface(
+    target_dir: Path,
+    use_hf_transfer: bool = True,
+    workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    link_from_cache: bool = False,
+    revision: str | None = None,
+    allow_patterns: list[str] | None = None,
+    ignore_patterns: list[str] | None = None,
+    priority_patterns: list[str] | None = None,
+) -> Path:
     """
-    Download SteadyDancer-14B from HuggingFace into target_dir.
+    Download SteadyDancer-14B from HuggingFace into target_dir (an existing,
+    resolved directory), fetching up to `workers` files concurrently.
+    `revision` (branch, tag or commit SHA) and the glob patterns are applied
+    to the file list, so filtered-out files are never fetched.
+
+    By default files are written straight into target_dir, one
+    hf_hub_download per file: files matching `priority_patterns` first, then
+    smallest first, each retried on its own. With
+    `link_from_cache`, they are downloaded into the shared HuggingFace cache
+    (HF_HUB_CACHE) and linked into target_dir, so further target
+    directories, or re-runs after deleting one, cost no download or extra
+    disk space.
 
     Requires:
       pip install 'huggingface_hub>=0.23'
+
+    Optional (much faster on high-bandwidth links):
+      pip install hf_transfer
     """
+    _configure_hf_transfer(use_hf_transfer)
+
     try:
         from huggingface_hub import snapshot_download  # type: ignore[import]
     except ImportError as exc:  # pragma: no cover - runtime dependency
-        print(
-            "ERROR: Python package 'huggingface_hub' is not installed.\n"
+        log.error(
+            "Python package 'huggingface_hub' is not installed.\n"
             "Install it first, for example:\n"
-            "  pip install 'huggingface_hub>=0.23'\n",
-            file=sys.stderr,
+            "  pip install 'huggingface_hub>=0.23'\n"
         )
         raise SystemExit(1) from exc
 
-    target_dir = target_dir.expanduser().resolve()
-    target_dir.mkdir(parents=True, exist_ok=True)
+    log.info(f"[HuggingFace] Downloading {HUGGINGFACE_MODEL_ID} into {target_dir} ...")
 
-    print(f"[HuggingFace] Downloading {HUGGINGFACE_MODEL_ID} into {target_dir} ...")
+    hub_kwargs = {
+        "repo_id": HUGGINGFACE_MODEL_ID,
+        "revision": revision,
+        "allow_patterns": allow_patterns,
+        "ignore_patterns": ignore_patterns,
+        "max_workers": workers,
+    }
 
-    # Use HF's local_dir so files live exactly under target_dir.
-    local_path_str = snapshot_download(  # type: ignore[call-arg]
-        repo_id=HUGGINGFACE_MODEL_ID,
-        local_dir=str(target_dir),
-        local_dir_use_symlinks=False,
+    # huggingface_hub>=0.23 always resumes *.incomplete files, so retries
+    # pick up where the failed attempt stopped.
+    if link_from_cache:
+        snapshot_dir = _with_retries(
+            "HuggingFace",
+            lambda: snapshot_download(**hub_kwargs),  # type: ignore[call-arg]
+        )
+        log.info(f"[HuggingFace] Linking cached snapshot {snapshot_dir} into {target_dir} ...")
+        _link_snapshot(Path(snapshot_dir), target_dir)
+        return target_dir
+
+    # Use HF's local_dir so files live exactly under target_dir (real files;
+    # huggingface_hub>=0.23 ignores the old local_dir_use_symlinks switch).
+    _download_files_huggingface(
+        target_dir,
+        workers=workers,
+        revision=revision,
+        allow_patterns=allow_patterns,
+        ignore_patterns=ignore_patterns,
+        priority_patterns=priority_patterns,
     )
-    local_path = Path(local_path_str).expanduser().resolve()
 
-    print(f"[HuggingFace] Model cached at: {local_path}")
-    return local_path
+    log.info(f"[HuggingFace] Model cached at: {target_dir}")
+    return target_dir
+
+
+def _sha256_of(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def verify_huggingface_checksums(
+    target_dir: Path,
+    revision: str | None = None,
+    workers: int | None = None,
+) -> None:
+    """
+    Check every LFS file under target_dir against the SHA256 recorded on the
+    HuggingFace hub, hashing files in parallel.
+
+    Corrupted files are deleted and downloaded again individually; a file
+    that still mismatches aborts with SystemExit. Small non-LFS files (the
+    hub only records git blob hashes for them) are not checked.
+    """
+    from huggingface_hub import HfApi, hf_hub_download  # type: ignore[import]
+
+    local_files = sorted(
+        path.relative_to(target_dir).as_posix()
+        for path in target_dir.rglob("*")
+        if path.is_file() and not path.relative_to(target_dir).parts[0].startswith(".")
+    )
+    infos = HfApi().get_paths_info(
+        HUGGINGFACE_MODEL_ID, paths=local_files, revision=revision
+    )
+    expected = {
+        info.path: info.lfs.sha256
+        for info in infos
+        if getattr(info, "lfs", None) is not None
+    }
+    if not expected:
+        log.info("[Verify] No LFS files to check.")
+        return
+
+    log.info(f"[Verify] Checking SHA256 of {len(expected)} files ...")
+    names = sorted(expected)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 4) as pool:
+        digests = pool.map(lambda name: _sha256_of(target_dir / name), names)
+        corrupted = [name for name, digest in zip(names, digests) if digest != expected[name]]
+
+    for name in corrupted:
+        log.warning(f"[Verify] Checksum mismatch for {name}; downloading it again ...")
+        (target_dir / name).unlink()
+        _with_retries(
+            "HuggingFace",
+            lambda: hf_hub_download(
+                HUGGINGFACE_MODEL_ID,
+                name,
+                revision=revision,
+                local_dir=str(target_dir),
+                force_download=True,
+            ),
+        )
+        if _sha256_of(target_dir / name) != expected[name]:
+            raise SystemExit(f"Checksum mismatch for {name} persists after re-download.")
+
+    log.info(f"[Verify] All checksums match ({len(corrupted)} file(s) re-downloaded).")
+
+
+def download_from_huggingface_aria2(
+    target_dir: Path,
+    workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    revision: str | None = None,
+    allow_patterns: list[str] | None = None,
+    ignore_patterns: list[str] | None = None,
+) -> Path:
+    """
+    Download SteadyDancer-14B from HuggingFace into target_dir (an existing,
+    resolved directory) with aria2c.
+
+    The repo's file list is resolved to download URLs and handed to a single
+    aria2c process, which fetches `workers` files at a time over
+    ARIA2_CONNECTIONS_PER_FILE ranged connections each and resumes partial
+    files on re-runs.
+
+    Requires aria2c on PATH and:
+      pip install 'huggingface_hub>=0.23'
+    """
+    from huggingface_hub import HfApi, get_token, hf_hub_url  # type: ignore[import]
+    from huggingface_hub.utils import filter_repo_objects  # type: ignore[import]
+
+    files = _with_retries(
+        "HuggingFace",
+        lambda: HfApi().list_repo_files(HUGGINGFACE_MODEL_ID, revision=revision),
+    )
+    files = list(
+        filter_repo_objects(files, allow_patterns=allow_patterns, ignore_patterns=ignore_patterns)
+    )
+    token = get_token()
+
+    lines: list[str] = []
+    for filename in files:
+        lines.append(hf_hub_url(HUGGINGFACE_MODEL_ID, filename, revision=revision))
+        lines.append(f"  out={filename}")
+        if token:
+            lines.append(f"  header=Authorization: Bearer {token}")
+
+    log.info(
+        f"[HuggingFace] Downloading {len(files)} files of {HUGGINGFACE_MODEL_ID} "
+        f"into {target_dir} with aria2c ..."
+    )
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", prefix="aria2-") as batch:
+        batch.write("\n".join(lines) + "\n")
+        batch.flush()
+        result = subprocess.run(
+            [
+                "aria2c",
+                "--input-file", batch.name,
+                "--dir", str(target_dir),
+                "--max-concurrent-downloads", str(workers),
+                "--max-connection-per-server", str(ARIA2_CONNECTIONS_PER_FILE),
+                "--split", str(ARIA2_CONNECTIONS_PER_FILE),
+                "--continue=true",
+                "--auto-file-renaming=false",
+                f"--max-tries={DOWNLOAD_ATTEMPTS}",
+                "--retry-wait=2",
+                "--console-log-level=warn",
+                "--summary-interval=0",
+                # --quiet: no console readout or result table at all.
+                *([] if log.isEnabledFor(logging.INFO) else ["--quiet=true"]),
+            ],
+            # stdout is reserved for the --json summary.
+            stdout=sys.stderr,
+            check=False,
+        )
+    if result.returncode != 0:
+        raise SystemExit(f"aria2c failed with exit code {result.returncode}.")
+
+    log.info(f"[HuggingFace] Model cached at: {target_dir}")
+    return target_dir
+
+
+def _last_used(path: Path) -> float:
+    """
+    Most recent access or modification time of any file under path.
+    """
+    latest = 0.0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                st = os.lstat(os.path.join(root, name))
+            except OSError:
+                continue
+            latest = max(latest, st.st_atime, st.st_mtime)
+    return latest
+
+
+def evict_snapshots(
+    models_root: Path,
+    keep: Path,
+    min_free_bytes: int | None = None,
+    max_cache_bytes: int | None = None,
+) -> None:
+    """
+    Delete least-recently-used snapshot directories under models_root until
+    at least `min_free_bytes` are free on its filesystem and the snapshots
+    take at most `max_cache_bytes` in total.
+
+    Only directories holding this script's snapshot marker are candidates,
+    and `keep` (the directory about to be downloaded into) never is; other
+    content of MODELS_DIR (DF11 outputs, hand-placed models) is left alone.
+    Concurrent runs are serialized with an flock on models_root.
+    """
+    if min_free_bytes is None and max_cache_bytes is None:
+        return
+    models_root.mkdir(parents=True, exist_ok=True)
+
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - non-POSIX
+        fcntl = None  # type: ignore[assignment]
+
+    with open(models_root / EVICTION_LOCK, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        snapshots = []
+        for child in models_root.iterdir():
+            if child.is_dir() and not child.is_symlink() and (child / SNAPSHOT_MARKER).is_file():
+                snapshots.append((child, _tree_stats(child)[1]))
+        cached_bytes = sum(size for _, size in snapshots)
+        candidates = sorted(
+            ((path, size) for path, size in snapshots if path != keep),
+            key=lambda item: _last_used(item[0]),
+        )
+
+        def _satisfied() -> bool:
+            if max_cache_bytes is not None and cached_bytes > max_cache_bytes:
+                return False
+            if min_free_bytes is not None:
+                return shutil.disk_usage(models_root).free >= min_free_bytes
+            return True
+
+        for path, size in candidates:
+            if _satisfied():
+                break
+            log.info(f"[Evict] Removing least recently used snapshot {path} ({size / 1024**3:.2f} GiB).")
+            shutil.rmtree(path, ignore_errors=True)
+            cached_bytes -= size
+
+        if not _satisfied():
+            log.warning("[Evict] No more snapshots to evict; disk space / cache limits not met.")
+
+
+def _download_from_source(source: str, target_dir: Path, args: argparse.Namespace) -> Path:
+    """
+    Download from a single source with the options given on the command line.
+    """
+    if source == "modelscope":
+        return download_from_modelscope(
+            target_dir,
+            workers=args.workers,
+            revision=args.revision,
+            allow_patterns=args.allow_patterns,
+            ignore_patterns=args.ignore_patterns,
+        )
+    if args.backend == "aria2":
+        if shutil.which("aria2c") is not None:
+            return download_from_huggingface_aria2(
+                target_dir,
+                workers=args.workers,
+                revision=args.revision,
+                allow_patterns=args.allow_patterns,
+                ignore_patterns=args.ignore_patterns,
+            )
+        log.warning("[HuggingFace] aria2c not found on PATH; falling back to hf_hub_download.")
+    return download_from_huggingface(
+        target_dir,
+        use_hf_transfer=not args.no_hf_transfer,
+        workers=args.workers,
+        link_from_cache=args.link_from_cache,
+        revision=args.revision,
+        allow_patterns=args.allow_patterns,
+        ignore_patterns=args.ignore_patterns,
+        priority_patterns=args.priority_patterns,
+    )
+
+
+def _race_worker(source: str, staging_dir: Path, args: argparse.Namespace, conn) -> None:
+    """
+    Process entry point for _race_sources: download and report the local path.
+    """
+    _configure_logging(args.quiet, args.json)
+    conn.send(str(_download_from_source(source, staging_dir, args)))
+    conn.close()
+
+
+def _tree_stats(path: Path) -> tuple[int, int]:
+    """
+    (file count, total bytes) of the files under path, symlinks not followed.
+    Hidden entries (the snapshot marker, hub metadata caches) are skipped.
+    """
+    count = total = 0
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if name.startswith("."):
+                continue
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+            count += 1
+    return count, total
+
+
+def _race_sources(target_dir: Path, args: argparse.Namespace) -> tuple[str, Path]:
+    """
+    Download from ModelScope and HuggingFace concurrently, each into its own
+    staging directory under target_dir, and keep the first to finish.
+
+    Neither hub client can be interrupted from another thread, so
+    each mirror runs in its own process and the slower one is terminated
+    (its partial files are removed). Returns (winning source, local path
+    inside its staging directory).
+    """
+    ctx = multiprocessing.get_context("spawn")
+    started = time.monotonic()
+    running: dict = {}
+    for source in ("modelscope", "huggingface"):
+        staging_dir = target_dir / f"{RACE_STAGING_PREFIX}{source}"
+        staging_dir.mkdir(exist_ok=True)
+        recv_conn, send_conn = ctx.Pipe(duplex=False)
+        proc = ctx.Process(
+            target=_race_worker,
+            args=(source, staging_dir, args, send_conn),
+            name=f"download-{source}",
+        )
+        proc.start()
+        send_conn.close()
+        running[proc.sentinel] = (source, proc, recv_conn, staging_dir)
+
+    winner: tuple[str, Path] | None = None
+    try:
+        while running and winner is None:
+            for sentinel in multiprocessing.connection.wait(list(running)):
+                source, proc, recv_conn, staging_dir = running.pop(sentinel)
+                proc.join()
+                try:
+                    local_path = Path(recv_conn.recv()) if proc.exitcode == 0 else None
+                except EOFError:
+                    local_path = None
+                recv_conn.close()
+                if local_path is None:
+                    log.warning(f"[Race] {source} download failed (exit code {proc.exitcode}).")
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+                elif winner is None:
+                    winner = (source, local_path)
+                else:
+                    # Both finished in the same wait(): drop the second copy.
+                    log.info(f"[Race] {source} also finished; discarding its copy.")
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+    finally:
+        for source, proc, recv_conn, staging_dir in running.values():
+            log.info(f"[Race] Cancelling {source} download.")
+            proc.terminate()
+            proc.join()
+            recv_conn.close()
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    if winner is None:
+        raise SystemExit("Both ModelScope and HuggingFace downloads failed.")
+
+    source, local_path = winner
+    elapsed = time.monotonic() - started
+    size_gb = _tree_stats(local_path)[1] / 1024**3
+    log.info(
+        f"[Race] {source} finished first: {size_gb:.2f} GiB in {elapsed:.0f}s "
+        f"({size_gb * 1024 / max(elapsed, 1e-3):.1f} MiB/s)."
+    )
+    return winner
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -138,15 +858,21 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     )
     parser.add_argument(
         "--source",
-        choices=["modelscope", "huggingface"],
+        choices=["modelscope", "huggingface", "both"],
         default="modelscope",
-        help="Download source (default: modelscope).",
+        help=(
+            "Download source (default: modelscope). 'both' downloads from both "
+            "mirrors at once and keeps the first to finish."
+        ),
     )
     parser.add_argument(
         "--models-dir",
         type=str,
         default=None,
-        help="Override MODELS_DIR root. Defaults to $MODELS_DIR or <repo_root>/models.",
+        help=(
+            "Override MODELS_DIR root. Defaults to $MODELS_DIR or the repo's "
+            "default models directory (libs.py_core.config.get_models_dir)."
+        ),
     )
     parser.add_argument(
         "--subdir",
@@ -154,37 +880,226 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=DEFAULT_MODEL_SUBDIR,
         help=f"Subdirectory under models root (default: {DEFAULT_MODEL_SUBDIR}).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_DOWNLOAD_WORKERS,
+        help=(
+            "Number of files to download concurrently "
+            f"(default: {DEFAULT_DOWNLOAD_WORKERS})."
+        ),
+    )
+    parser.add_argument(
+        "--revision",
+        type=str,
+        default=None,
+        help="Branch, tag or commit SHA to download (default: the hub's default branch).",
+    )
+    parser.add_argument(
+        "--allow-patterns",
+        nargs="*",
+        default=None,
+        metavar="GLOB",
+        help="Only download files matching these glob patterns (default: all files).",
+    )
+    parser.add_argument(
+        "--ignore-patterns",
+        nargs="*",
+        default=DEFAULT_IGNORE_PATTERNS,
+        metavar="GLOB",
+        help=(
+            "Skip files matching these glob patterns "
+            f"(default: {' '.join(DEFAULT_IGNORE_PATTERNS)}; pass no value to keep all)."
+        ),
+    )
+    parser.add_argument(
+        "--verify-checksums",
+        action="store_true",
+        help=(
+            "After a HuggingFace download, check each weight file's SHA256 against "
+            "the hub and re-download corrupted files."
+        ),
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only log warnings and errors, and hide per-file progress bars.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help=(
+            "Print a single JSON summary line on stdout "
+            '(e.g. {"status": "ok", "files": N, "bytes": B, "seconds": T}); '
+            "logs go to stderr."
+        ),
+    )
+    parser.add_argument(
+        "--priority-patterns",
+        nargs="*",
+        default=None,
+        metavar="GLOB",
+        help=(
+            "HuggingFace only: download files matching these glob patterns first, "
+            "in the given order (others follow, smallest first)."
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run the download even if the target directory already holds a snapshot.",
+    )
+    parser.add_argument(
+        "--snapshot-ttl-hours",
+        type=float,
+        default=DEFAULT_SNAPSHOT_TTL_HOURS,
+        help=(
+            "Reuse a completed download this recent without contacting the hub "
+            f"(default: {DEFAULT_SNAPSHOT_TTL_HOURS:g}). Older HuggingFace "
+            "snapshots are checked against the repo's latest commit."
+        ),
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["hub", "aria2"],
+        default="hub",
+        help=(
+            "HuggingFace downloader: 'hub' fetches files with huggingface_hub's "
+            "hf_hub_download on a thread pool, "
+            "'aria2' hands the file list to aria2c for multi-connection downloads "
+            "(falls back to 'hub' if aria2c is not installed)."
+        ),
+    )
+    parser.add_argument(
+        "--min-free-gb",
+        type=float,
+        default=None,
+        help=(
+            "Before downloading, delete least recently used snapshots previously "
+            "downloaded by this script into the models root until this much disk "
+            "space is free (default: no eviction)."
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-gb",
+        type=float,
+        default=None,
+        help=(
+            "Before downloading, evict least recently used snapshots until those "
+            "downloaded by this script take at most this much space (default: no limit)."
+        ),
+    )
+    parser.add_argument(
+        "--link-from-cache",
+        action="store_true",
+        help=(
+            "HuggingFace only: download into the shared HuggingFace cache and "
+            "hardlink the files into the target directory instead of storing "
+            "a separate copy."
+        ),
+    )
+    parser.add_argument(
+        "--no-hf-transfer",
+        action="store_true",
+        help="Do not use hf_transfer for HuggingFace downloads, even if installed.",
+    )
     return parser.parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> None:
     args = parse_args(argv)
+    _configure_logging(args.quiet, args.json)
+
+    if not args.json:
+        _run(args)
+        return
+
+    started = time.monotonic()
+    try:
+        summary = _run(args)
+    except (Exception, SystemExit) as exc:
+        if isinstance(exc, SystemExit) and exc.code in (None, 0):
+            raise
+        print(json.dumps({"status": "error", "error": str(exc) or type(exc).__name__}))
+        raise
+    summary["seconds"] = round(time.monotonic() - started, 3)
+    print(json.dumps(summary))
+
+
+def _run(args: argparse.Namespace) -> dict:
+    """
+    Body of main(): resolve the target directory, download if needed and
+    return a summary of the result.
+    """
 
     models_root = resolve_models_root(args.models_dir)
-    target_dir = (models_root / args.subdir).expanduser().resolve()
+    # Resolved once here; the download helpers take it as-is.
+    target_dir = (models_root / args.subdir).resolve()
     target_dir.mkdir(parents=True, exist_ok=True)
 
-    print(f"Resolved MODELS_DIR root: {models_root}")
-    print(f"Target model directory: {target_dir}")
+    log.info(f"Resolved MODELS_DIR root: {models_root}")
+    log.info(f"Target model directory: {target_dir}")
+
+    source: Literal["modelscope", "huggingface", "both"] = args.source
+    if source != "modelscope":
+        _configure_hf_transfer(not args.no_hf_transfer)
+
+    request = {
+        "source": source,
+        "requested_revision": args.revision,
+        "allow_patterns": args.allow_patterns,
+        "ignore_patterns": args.ignore_patterns,
+    }
 
-    # Fast path: if target_dir already looks like a prepared SteadyDancer
-    # directory, skip any network calls and re-use it as-is.
-    if (target_dir / "config.json").exists() or (target_dir / "configuration.json").exists():
-        print("[Skip] Detected existing SteadyDancer files in target directory, skipping download.")
+    # Fast path: a marker written by a completed download lets us skip the
+    # network entirely (or, once stale, revalidate with a single API call).
+    marker = None if args.force else _read_snapshot_marker(target_dir)
+    if marker is not None and _snapshot_is_current(marker, request, args.snapshot_ttl_hours):
+        log.info("[Skip] Snapshot already downloaded and up to date, skipping download.")
+        mirror = marker.get("mirror", source)
+        if time.time() - float(marker.get("timestamp", 0)) >= args.snapshot_ttl_hours * 3600:
+            _write_snapshot_marker(target_dir, request, mirror, marker.get("revision"))
         local_path = target_dir
+        downloaded = False
+    # Directories prepared before markers existed: if target_dir already
+    # looks like a SteadyDancer directory, re-use it as-is. Small files are
+    # fetched first, so a config.json next to download traces means an
+    # interrupted download, which must resume instead.
+    elif (
+        not args.force
+        and marker is None
+        and ((target_dir / "config.json").exists() or (target_dir / "configuration.json").exists())
+        and not _download_started(target_dir)
+    ):
+        log.info(
+            "[Skip] Detected existing SteadyDancer files in target directory, skipping download "
+            "(use --force to re-validate)."
+        )
+        local_path = target_dir
+        mirror = None
+        downloaded = False
     else:
-        source: Literal["modelscope", "huggingface"] = args.source
-        if source == "modelscope":
-            local_path = download_from_modelscope(target_dir)
+        downloaded = True
+        evict_snapshots(
+            models_root,
+            keep=target_dir,
+            min_free_bytes=None if args.min_free_gb is None else int(args.min_free_gb * 1024**3),
+            max_cache_bytes=None if args.cache_max_gb is None else int(args.cache_max_gb * 1024**3),
+        )
+        staging_dir: Path | None = None
+        if source == "both":
+            mirror, local_path = _race_sources(target_dir, args)
+            staging_dir = target_dir / f"{RACE_STAGING_PREFIX}{mirror}"
         else:
-            local_path = download_from_huggingface(target_dir)
+            mirror = source
+            local_path = _download_from_source(source, target_dir, args)
 
         # For some backends (e.g. ModelScope), snapshot_download may place
         # files under a nested directory like:
         #   <target_dir>/<org>/<model-id>/
         # To keep our layout stable, flatten that structure into target_dir.
         if local_path != target_dir:
-            print(f"[Layout] Flattening from {local_path} into {target_dir} ...")
+            log.info(f"[Layout] Flattening from {local_path} into {target_dir} ...")
             for child in local_path.iterdir():
                 dest = target_dir / child.name
                 if dest.exists():
@@ -199,16 +1114,38 @@ def main(argv: list[str] | None = None) -> None:
             except OSError:
                 # It's fine to leave empty or partially-empty directories behind.
                 pass
+            if staging_dir is not None:
+                shutil.rmtree(staging_dir, ignore_errors=True)
             local_path = target_dir
 
-    print("\nDone.")
-    print(f"Final model path: {local_path}")
-    print(
+        if args.verify_checksums:
+            if mirror == "huggingface":
+                verify_huggingface_checksums(target_dir, args.revision)
+            else:
+                # modelscope's snapshot_download already validates file hashes.
+                log.info("[Verify] Skipping checksum pass: ModelScope verifies files while downloading.")
+
+        revision = _hf_remote_revision(args.revision) if mirror == "huggingface" else None
+        _write_snapshot_marker(target_dir, request, mirror, revision)
+
+    log.info("\nDone.")
+    log.info(f"Final model path: {local_path}")
+    log.info(
         "\nFor inference, ensure the environment variable STEADYDANCER_CKPT_DIR "
         "is set to this path, or leave it empty to let the code default to "
         f"{models_root / DEFAULT_MODEL_SUBDIR}."
     )
 
+    files, total_bytes = _tree_stats(local_path)
+    return {
+        "status": "ok",
+        "path": str(local_path),
+        "downloaded": downloaded,
+        "mirror": mirror,
+        "files": files,
+        "bytes": total_bytes,
+    }
+
 
 if __name__ == "__main__":
     main()